@@ -12,7 +12,7 @@ from alembic import context
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.database import Base
-from app.models import Host, Party, RSVP
+from app.models import Host, Party, RSVP, RSVPClosure
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
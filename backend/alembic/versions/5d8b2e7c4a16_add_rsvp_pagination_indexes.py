@@ -0,0 +1,27 @@
+"""Add indexes for paginated RSVP lists
+
+Revision ID: 5d8b2e7c4a16
+Revises: c3e1f5a9d2b7
+Create Date: 2026-10-17 14:37:05.118462
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8b2e7c4a16'
+down_revision: Union[str, None] = 'c3e1f5a9d2b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_rsvps_party_id_created_at_id', 'rsvps', ['party_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_rsvps_party_id_is_attending', 'rsvps', ['party_id', 'is_attending'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rsvps_party_id_is_attending', table_name='rsvps')
+    op.drop_index('ix_rsvps_party_id_created_at_id', table_name='rsvps')
@@ -0,0 +1,28 @@
+"""Add version counter to parties
+
+Revision ID: 9b6f3d2e8a41
+Revises: e7a4c1d9b352
+Create Date: 2026-10-17 17:21:12.604385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b6f3d2e8a41'
+down_revision: Union[str, None] = 'e7a4c1d9b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('parties', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('parties', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,90 @@
+"""Add indexes for RSVP access paths
+
+Revision ID: c3e1f5a9d2b7
+Revises: 74aa414e8614
+Create Date: 2026-10-17 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import secrets
+import string
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1f5a9d2b7'
+down_revision: Union[str, None] = '74aa414e8614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Collapse duplicate (party_id, guest_phone) RSVPs onto the oldest row so the
+    # unique index can be built; invitees of a removed duplicate move to the kept row.
+    op.execute(
+        """
+        UPDATE rsvps SET invited_by_rsvp_id = (
+            SELECT MIN(keeper.id) FROM rsvps keeper
+            JOIN rsvps dup ON dup.party_id = keeper.party_id AND dup.guest_phone = keeper.guest_phone
+            WHERE dup.id = rsvps.invited_by_rsvp_id
+        )
+        WHERE invited_by_rsvp_id NOT IN (
+            SELECT MIN(id) FROM rsvps GROUP BY party_id, guest_phone
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM rsvps WHERE id NOT IN (
+            SELECT MIN(id) FROM rsvps GROUP BY party_id, guest_phone
+        )
+        """
+    )
+
+    # Codes came from random before secrets, so two RSVPs can share one. The
+    # oldest holder keeps it; the others get a fresh code so the unique index
+    # can be built.
+    conn = op.get_bind()
+    colliding_ids = conn.execute(sa.text(
+        """
+        SELECT id FROM rsvps
+        WHERE invitation_code IN (
+            SELECT invitation_code FROM rsvps WHERE invitation_code IS NOT NULL
+            GROUP BY invitation_code HAVING COUNT(*) > 1
+        )
+        AND id NOT IN (
+            SELECT MIN(id) FROM rsvps WHERE invitation_code IS NOT NULL GROUP BY invitation_code
+        )
+        """
+    )).scalars().all()
+    characters = string.ascii_uppercase + string.digits
+    for rsvp_id in colliding_ids:
+        while True:
+            code = ''.join(secrets.choice(characters) for _ in range(12))
+            taken = conn.execute(
+                sa.text("SELECT 1 FROM rsvps WHERE invitation_code = :code"), {"code": code}
+            ).first()
+            if not taken:
+                break
+        conn.execute(
+            sa.text("UPDATE rsvps SET invitation_code = :code WHERE id = :id"), {"code": code, "id": rsvp_id}
+        )
+
+    op.create_index('ix_rsvps_party_id_guest_phone', 'rsvps', ['party_id', 'guest_phone'], unique=True)
+    op.create_index(op.f('ix_rsvps_guest_phone'), 'rsvps', ['guest_phone'], unique=False)
+    op.create_index(op.f('ix_rsvps_invitation_code'), 'rsvps', ['invitation_code'], unique=True)
+    op.create_index(
+        'ix_rsvps_invited_by_rsvp_id_is_attending_created_at',
+        'rsvps',
+        ['invited_by_rsvp_id', 'is_attending', 'created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rsvps_invited_by_rsvp_id_is_attending_created_at', table_name='rsvps')
+    op.drop_index(op.f('ix_rsvps_invitation_code'), table_name='rsvps')
+    op.drop_index(op.f('ix_rsvps_guest_phone'), table_name='rsvps')
+    op.drop_index('ix_rsvps_party_id_guest_phone', table_name='rsvps')
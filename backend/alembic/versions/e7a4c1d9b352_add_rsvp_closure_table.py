@@ -0,0 +1,50 @@
+"""Add rsvp_closure table of RSVP ancestry
+
+Revision ID: e7a4c1d9b352
+Revises: 5d8b2e7c4a16
+Create Date: 2026-10-17 16:02:41.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a4c1d9b352'
+down_revision: Union[str, None] = '5d8b2e7c4a16'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('rsvp_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['rsvps.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['rsvps.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    op.create_index('ix_rsvp_closure_descendant_id_depth', 'rsvp_closure', ['descendant_id', 'depth'], unique=False)
+
+    # Backfill every existing RSVP's ancestry by walking invited_by_rsvp_id upwards
+    op.execute(
+        """
+        INSERT INTO rsvp_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE ancestry (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM rsvps
+            UNION ALL
+            SELECT rsvps.invited_by_rsvp_id, ancestry.descendant_id, ancestry.depth + 1
+            FROM rsvps JOIN ancestry ON rsvps.id = ancestry.ancestor_id
+            WHERE rsvps.invited_by_rsvp_id IS NOT NULL
+        )
+        SELECT ancestor_id, descendant_id, depth FROM ancestry
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_rsvp_closure_descendant_id_depth', table_name='rsvp_closure')
+    op.drop_table('rsvp_closure')
@@ -1,7 +1,16 @@
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+import functools
+import inspect
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -9,9 +18,96 @@ load_dotenv()
 # Database URL - will be set from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./thirddegree.db")
 
+# Serve routes from an AsyncEngine (asyncpg / aiosqlite) instead of the threadpool
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Connection pool settings. DB_POOL_MODE=null disables app-side pooling for use
+# behind an external pooler (PgBouncer, Neon's pooled endpoint).
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "300"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
 # Create Base class for models
 Base = declarative_base()
 
+class PoolWaitStats:
+    """Running totals of how long checkouts waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3)
+            }
+
+class _TimedPoolMixin:
+    """Times every checkout, including the wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+def get_pool_options(is_async: bool = False) -> dict:
+    """Engine keyword arguments for the configured pooling mode."""
+    url = make_url(DATABASE_URL)
+    if DB_POOL_MODE == "null":
+        if is_async and url.get_backend_name() == "postgresql":
+            # A transaction-mode pooler hands each transaction a different server
+            # connection, where asyncpg's prepared statements don't exist
+            return {
+                "poolclass": NullPool,
+                "connect_args": {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+            }
+        return {"poolclass": NullPool}
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # An in-memory database lives in its connection; keep SQLAlchemy's default pool
+        return {}
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING
+    }
+
 # Lazy initialization of engine and session
 _engine = None
 _SessionLocal = None
@@ -19,7 +115,7 @@ _SessionLocal = None
 def get_engine():
     global _engine
     if _engine is None:
-        _engine = create_engine(DATABASE_URL)
+        _engine = create_engine(DATABASE_URL, **get_pool_options())
     return _engine
 
 def get_session_local():
@@ -36,3 +132,159 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async engine and session, used when DATABASE_ASYNC is enabled
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_database_url(url: str = DATABASE_URL) -> str:
+    """Translate DATABASE_URL to the matching async driver (asyncpg or aiosqlite)."""
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql":
+        # asyncpg takes ssl= instead of libpq's sslmode= and has no channel_binding
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        if sslmode:
+            query["ssl"] = sslmode
+        url = url.set(drivername="postgresql+asyncpg", query=query)
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine
+        _async_engine = create_async_engine(get_async_database_url(), **get_pool_options(is_async=True))
+    return _async_engine
+
+def get_async_session_local():
+    global _AsyncSessionLocal
+    if _AsyncSessionLocal is None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+        # Objects must stay readable after commit: the response is serialized
+        # outside the session's greenlet, where lazy refreshes cannot run.
+        _AsyncSessionLocal = async_sessionmaker(
+            autoflush=False, expire_on_commit=False, bind=get_async_engine()
+        )
+    return _AsyncSessionLocal
+
+def _dispose_engines_after_fork():
+    """Drop connections inherited from the parent so forked workers (gunicorn --preload) open their own."""
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_dispose_engines_after_fork)
+
+def get_pool_stats() -> dict:
+    """Live statistics for each engine's connection pool that has been created."""
+    engines = {
+        "sync": _engine,
+        "async": _async_engine.sync_engine if _async_engine is not None else None
+    }
+    stats = {}
+    for name, engine in engines.items():
+        if engine is None:
+            continue
+        pool = engine.pool
+        pool_stats = {"pool": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            pool_stats.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+                "max_overflow": DB_MAX_OVERFLOW
+            })
+        if hasattr(pool, "wait_stats"):
+            pool_stats.update(pool.wait_stats.as_dict())
+        stats[name] = pool_stats
+    return stats
+
+# Dependency to get async database session
+async def get_async_db():
+    AsyncSessionLocal = get_async_session_local()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Session dependency for native async endpoints that mix database work with other awaits
+get_session = get_async_db if DATABASE_ASYNC else get_db
+
+async def run_in_session(db, fn, *args):
+    """Run fn(session, *args) on a session from get_session without blocking the event loop."""
+    if DATABASE_ASYNC:
+        return await db.run_sync(fn, *args)
+    return await run_in_threadpool(fn, db, *args)
+
+def session_endpoint(func):
+    """Adapt a Session-based endpoint or dependency to the configured database mode.
+
+    In sync mode func is returned unchanged and FastAPI runs it in its threadpool.
+    With DATABASE_ASYNC enabled it becomes a coroutine that receives an AsyncSession
+    and runs func's body on it through AsyncSession.run_sync, so requests don't queue
+    on the threadpool while waiting on the database. func must take the session as
+    its db parameter.
+
+    The whole body then runs on the event loop thread, so CPU-heavy work in it
+    (and FastAPI's validation of what it returns) stalls every other request on
+    the worker. Endpoints with large responses or uploads are native coroutines
+    instead: database work through run_in_session, the rest in the threadpool.
+    """
+    if not DATABASE_ASYNC:
+        return func
+    
+    signature = inspect.signature(func)
+    parameters = [
+        param.replace(default=Depends(get_async_db), annotation=inspect.Parameter.empty)
+        if param.name == "db" else param
+        for param in signature.parameters.values()
+    ]
+    
+    @functools.wraps(func)
+    async def endpoint(*args, db, **kwargs):
+        return await db.run_sync(lambda session: func(*args, db=session, **kwargs))
+    
+    endpoint.__signature__ = signature.replace(parameters=parameters)
+    return endpoint
+
+def dialect_insert(db, model):
+    """Return an INSERT for model that supports ON CONFLICT and RETURNING, if the dialect has them.
+
+    PostgreSQL and SQLite (3.35+) get their dialect-specific insert(); anything
+    else returns None so callers can fall back to plain ORM writes.
+    """
+    dialect = db.get_bind().dialect
+    if not dialect.insert_returning:
+        return None
+    if dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
+
+def insert_or_none(db, model, values: dict):
+    """INSERT one row and return it as an ORM object, or None if a unique constraint conflicted.
+
+    Uses ON CONFLICT DO NOTHING RETURNING where available, otherwise a plain
+    insert inside a savepoint, so a conflict never aborts the caller's transaction.
+    """
+    insert = dialect_insert(db, model)
+    if insert is not None:
+        return db.scalars(
+            insert.values(**values).on_conflict_do_nothing().returning(model),
+            execution_options={"populate_existing": True}
+        ).first()
+    
+    try:
+        with db.begin_nested():
+            obj = model(**values)
+            db.add(obj)
+        return obj
+    except IntegrityError:
+        return None
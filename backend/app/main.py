@@ -1,8 +1,14 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 
+from app.database import get_pool_stats
+from app.utils.cache import host_cache, party_cache, tree_cache
+from app.utils.events import event_broker
+from app.utils.query_stats import QUERY_STATS_ENABLED, QueryStatsMiddleware
+from app.utils.metrics import METRICS_ENABLED, MetricsMiddleware, metrics_response, require_metrics_token
+
 app = FastAPI(
     title="Third Degree API",
     description="Party RSVP Webapp API",
@@ -27,6 +33,14 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Per-request query count and DB time headers, for spotting N+1 queries
+if QUERY_STATS_ENABLED:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Per-route request counts and latency histograms, served at /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 @app.get("/")
 async def root():
     return {"message": "Third Degree API is running"}
@@ -35,6 +49,26 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/db", dependencies=[Depends(require_metrics_token)])
+async def database_pool_stats():
+    """Live connection pool statistics for this worker, for sizing pools."""
+    return get_pool_stats()
+
+@app.get("/health/cache", dependencies=[Depends(require_metrics_token)])
+async def cache_stats():
+    """Hit/miss counters for this worker's in-process caches."""
+    return {"party": party_cache.stats(), "host": host_cache.stats(), "tree": tree_cache.stats()}
+
+@app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_metrics_token)])
+async def metrics():
+    """Prometheus metrics, aggregated across gunicorn workers."""
+    return metrics_response()
+
+@app.get("/health/events", dependencies=[Depends(require_metrics_token)])
+async def event_stats():
+    """Live event stream subscribers connected to this worker."""
+    return event_broker.stats()
+
 
 # Include routers
 from app.routes import auth, parties, rsvp
@@ -1,5 +1,6 @@
 from .host import Host
 from .party import Party
 from .rsvp import RSVP
+from .rsvp_closure import RSVPClosure
 
-__all__ = ["Host", "Party", "RSVP"]
+__all__ = ["Host", "Party", "RSVP", "RSVPClosure"]
@@ -13,6 +13,7 @@ class Party(Base):
     description = Column(Text, nullable=True)
     invite_code = Column(String(20), unique=True, index=True, nullable=False)  # For guest access
     host_id = Column(Integer, ForeignKey("hosts.id"), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped on every write to the party or its RSVPs (ETags)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
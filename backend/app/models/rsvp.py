@@ -1,21 +1,30 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
 
 class RSVP(Base):
     __tablename__ = "rsvps"
+    __table_args__ = (
+        # One RSVP per guest per party; also serves lookups by party_id alone
+        Index("ix_rsvps_party_id_guest_phone", "party_id", "guest_phone", unique=True),
+        # Keyset pagination of a party's RSVPs, and attending counts
+        Index("ix_rsvps_party_id_created_at_id", "party_id", "created_at", "id"),
+        Index("ix_rsvps_party_id_is_attending", "party_id", "is_attending"),
+        # First attending invitee of an inviter (guest dashboard)
+        Index("ix_rsvps_invited_by_rsvp_id_is_attending_created_at", "invited_by_rsvp_id", "is_attending", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     guest_name = Column(String(100), nullable=False)
-    guest_phone = Column(String(10), nullable=False)
+    guest_phone = Column(String(10), nullable=False, index=True)
     is_attending = Column(Boolean, nullable=False)  # True for "Yes", False for "No"
     party_id = Column(Integer, ForeignKey("parties.id"), nullable=False)
     
     # Kevin Bacon rule fields
     degree = Column(Integer, nullable=False, default=1)  # 1st, 2nd, or 3rd degree
     invited_by_rsvp_id = Column(Integer, ForeignKey("rsvps.id"), nullable=True)  # Who invited this person
-    invitation_code = Column(String(20), nullable=True, unique=True)  # Unique code for this RSVP's invitations
+    invitation_code = Column(String(20), nullable=True, unique=True, index=True)  # Unique code for this RSVP's invitations
     is_confirmed = Column(Boolean, nullable=False, default=False)  # True when chain is complete
     has_sent_invitation = Column(Boolean, nullable=False, default=False)  # Has this person sent an invitation?
     
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.database import Base
+
+class RSVPClosure(Base):
+    """Ancestry of every RSVP: one row per (inviter upstream, RSVP) pair, plus a depth 0 row for itself.
+
+    Maintained on insert (see app.utils.closure); RSVPs never change inviter,
+    so rows are only ever added, or removed with their RSVPs.
+    """
+    __tablename__ = "rsvp_closure"
+    __table_args__ = (
+        # Ancestors of an RSVP (chain confirmation, root lookups)
+        Index("ix_rsvp_closure_descendant_id_depth", "descendant_id", "depth"),
+    )
+    
+    # The primary key (ancestor_id, descendant_id) serves subtree queries
+    ancestor_id = Column(Integer, ForeignKey("rsvps.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(Integer, ForeignKey("rsvps.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)  # Invitation hops from ancestor down to descendant
@@ -3,38 +3,99 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from typing import Optional
+import time
 
-from app.database import get_db
+from app.database import get_db, get_session, run_in_session, session_endpoint
 from app.models.host import Host
-from app.schemas import HostCreate, HostLogin, HostSetup, HostResponse, Token
-from app.utils.security import verify_password, get_password_hash, create_access_token, verify_token
+from app.schemas import HostCreate, HostLogin, HostSetup, HostResponse, HostIdentity, Token
+from app.utils.security import (
+    HashingBusyError, create_access_token, decode_token, hash_password_async, hashing_available,
+    verify_and_update_password_async
+)
+from app.utils.cache import host_cache
 from app.utils.helpers import format_phone_number
 
 router = APIRouter()
 security = HTTPBearer()
 
-def get_current_host(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> Host:
-    """Get the current authenticated host from JWT token."""
+def _credentials_exception(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+@session_endpoint
+def get_current_host_identity(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> HostIdentity:
+    """Get the current host's id and phone from the JWT token, without loading the host row.
+
+    Verified tokens are cached briefly. Tokens carrying the host id claim need no
+    query at all; older tokens with only the phone are resolved once per cache entry.
+    """
     token = credentials.credentials
-    phone = verify_token(token)
-    if phone is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    identity = host_cache.get(token)
+    if identity is not None:
+        return identity
     
-    host = db.query(Host).filter(Host.phone == phone).first()
+    payload = decode_token(token)
+    if payload is None:
+        raise _credentials_exception("Could not validate credentials")
+    
+    if payload.get("hid") is not None:
+        identity = HostIdentity(id=payload["hid"], phone=payload["sub"])
+    else:
+        host = db.query(Host).filter(Host.phone == payload["sub"]).first()
+        if host is None:
+            raise _credentials_exception("Host not found")
+        identity = HostIdentity(id=host.id, phone=host.phone)
+    
+    # Never keep a token cached past its expiry
+    host_cache.set(token, identity, ttl=payload["exp"] - time.time())
+    return identity
+
+@session_endpoint
+def get_current_host(identity: HostIdentity = Depends(get_current_host_identity), db: Session = Depends(get_db)) -> Host:
+    """Get the current authenticated host from JWT token."""
+    host = db.get(Host, identity.id)
     if host is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Host not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _credentials_exception("Host not found")
+    return host
+
+def _hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in requests, please try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+def _find_host_by_phone(db: Session, phone: str) -> Optional[Host]:
+    """Look up a host and close the session in the same call, so no connection is held while hashing."""
+    host = db.query(Host).filter(Host.phone == phone).first()
+    db.close()
     return host
 
+def _create_host(db: Session, phone: str, password_hash: str, name: Optional[str]) -> Host:
+    host = Host(
+        phone=phone,
+        password_hash=password_hash,
+        name=name,
+        is_setup_complete=bool(name)  # Complete setup if name provided
+    )
+    
+    db.add(host)
+    db.commit()
+    db.refresh(host)
+    return host
+
+def _update_password_hash(db: Session, host_id: int, password_hash: str):
+    db.query(Host).filter(Host.id == host_id).update({"password_hash": password_hash})
+    db.commit()
+
+# signup and login are native coroutines so password hashing can be awaited in
+# the hashing process pool while the database work runs through run_in_session.
+
 @router.post("/signup", response_model=HostResponse)
-def signup(host_data: HostCreate, db: Session = Depends(get_db)):
+async def signup(host_data: HostCreate, db: Session = Depends(get_session)):
     """Create a new host account."""
     # Format phone number
     phone = format_phone_number(host_data.phone)
@@ -44,30 +105,28 @@ def signup(host_data: HostCreate, db: Session = Depends(get_db)):
             detail="Phone number must be 10 digits"
         )
     
+    # Turn the request away before spending a connection on it if hashing is saturated
+    if not hashing_available():
+        raise _hashing_busy_exception()
+    
     # Check if host already exists
-    existing_host = db.query(Host).filter(Host.phone == phone).first()
+    existing_host = await run_in_session(db, _find_host_by_phone, phone)
     if existing_host:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Phone number already registered"
         )
     
-    # Create new host
-    host = Host(
-        phone=phone,
-        password_hash=get_password_hash(host_data.password),
-        name=host_data.name,
-        is_setup_complete=bool(host_data.name)  # Complete setup if name provided
-    )
-    
-    db.add(host)
-    db.commit()
-    db.refresh(host)
+    try:
+        password_hash = await hash_password_async(host_data.password)
+    except HashingBusyError:
+        raise _hashing_busy_exception()
     
-    return host
+    # Create new host
+    return await run_in_session(db, _create_host, phone, password_hash, host_data.name)
 
 @router.post("/login", response_model=Token)
-def login(login_data: HostLogin, db: Session = Depends(get_db)):
+async def login(login_data: HostLogin, db: Session = Depends(get_session)):
     """Login with phone and password."""
     # Format phone number
     phone = format_phone_number(login_data.phone)
@@ -77,9 +136,20 @@ def login(login_data: HostLogin, db: Session = Depends(get_db)):
             detail="Phone number must be 10 digits"
         )
     
+    # Turn the request away before spending a connection on it if hashing is saturated
+    if not hashing_available():
+        raise _hashing_busy_exception()
+    
     # Find host
-    host = db.query(Host).filter(Host.phone == phone).first()
-    if not host or not verify_password(login_data.password, host.password_hash):
+    host = await run_in_session(db, _find_host_by_phone, phone)
+    verified = False
+    if host:
+        try:
+            verified, new_hash = await verify_and_update_password_async(login_data.password, host.password_hash)
+        except HashingBusyError:
+            raise _hashing_busy_exception()
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect phone number or password",
@@ -89,12 +159,17 @@ def login(login_data: HostLogin, db: Session = Depends(get_db)):
     # Create access token
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
-        data={"sub": host.phone}, expires_delta=access_token_expires
+        data={"sub": host.phone, "hid": host.id}, expires_delta=access_token_expires
     )
     
+    # Upgrade the stored hash if hashing parameters have changed
+    if new_hash:
+        await run_in_session(db, _update_password_hash, host.id, new_hash)
+    
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/setup", response_model=HostResponse)
+@session_endpoint
 def setup_host(setup_data: HostSetup, current_host: Host = Depends(get_current_host), db: Session = Depends(get_db)):
     """Complete host setup (set name)."""
     if current_host.is_setup_complete:
@@ -109,6 +184,7 @@ def setup_host(setup_data: HostSetup, current_host: Host = Depends(get_current_h
     
     db.commit()
     db.refresh(current_host)
+    host_cache.invalidate_where(lambda identity: identity.id == current_host.id)
     
     return current_host
 
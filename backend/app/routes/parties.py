@@ -1,55 +1,74 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, delete, func, select
+from sqlalchemy.orm import Session, aliased
+from typing import List, Optional
 from datetime import datetime
+import csv
+import io
+import json
 
-from app.database import get_db
-from app.models.host import Host
+from app.database import (
+    dialect_insert, get_db, get_session, get_session_local, insert_or_none, run_in_session, session_endpoint
+)
 from app.models.party import Party
 from app.models.rsvp import RSVP
-from app.schemas import PartyCreate, PartyResponse, PartyListResponse
-from app.routes.auth import get_current_host
-from app.utils.helpers import generate_invite_code
+from app.models.rsvp_closure import RSVPClosure
+from app.schemas import (
+    HostIdentity, InvitationTreeResponse, PartyCreate, PartyResponse, PartyListResponse, RSVPImportResponse
+)
+from app.routes.auth import get_current_host_identity
+from app.utils.helpers import generate_invite_code, generate_rsvp_invitation_code
+from app.utils.codes import MAX_CODE_ATTEMPTS, CodeAllocationError, allocate_unique_code
+from app.utils.guest_import import GuestImportError, normalize_guest, parse_guest_upload
+from app.utils.cache import party_cache, tree_cache
+from app.utils.closure import add_root_closure_rows
+from app.utils.events import event_broker, party_channel
+from app.utils.pagination import MAX_PAGE_SIZE, filter_rsvps, paginate_rsvps
+from app.utils.tree import build_invitation_tree
+from app.utils.versions import bump_party_version, etag_matches, party_etag
 
 router = APIRouter()
 
 @router.post("/", response_model=PartyResponse)
-def create_party(party_data: PartyCreate, current_host: Host = Depends(get_current_host), db: Session = Depends(get_db)):
+@session_endpoint
+def create_party(party_data: PartyCreate, current_host: HostIdentity = Depends(get_current_host_identity), db: Session = Depends(get_db)):
     """Create a new party."""
-    # Generate unique invite code
-    invite_code = generate_invite_code()
-    
-    # Ensure invite code is unique
-    while db.query(Party).filter(Party.invite_code == invite_code).first():
-        invite_code = generate_invite_code()
-    
-    # Create party
-    party = Party(
-        name=party_data.name,
-        start_time=party_data.start_time,
-        location=party_data.location,
-        description=party_data.description,
-        invite_code=invite_code,
-        host_id=current_host.id
+    # Create party with a unique invite code; the unique index rejects collisions
+    values = {
+        "name": party_data.name,
+        "start_time": party_data.start_time,
+        "location": party_data.location,
+        "description": party_data.description,
+        "host_id": current_host.id
+    }
+    party = allocate_unique_code(
+        lambda code: insert_or_none(db, Party, {**values, "invite_code": code}),
+        generate_invite_code
     )
     
-    db.add(party)
     db.commit()
     db.refresh(party)
     
     return party
 
 @router.get("/", response_model=List[PartyListResponse])
-def get_host_parties(current_host: Host = Depends(get_current_host), db: Session = Depends(get_db)):
+@session_endpoint
+def get_host_parties(current_host: HostIdentity = Depends(get_current_host_identity), db: Session = Depends(get_db)):
     """Get all parties for the current host."""
-    parties = db.query(Party).filter(Party.host_id == current_host.id).all()
+    # Count RSVPs per party in the database instead of loading every RSVP row
+    rows = db.query(
+        Party,
+        func.count(RSVP.id),
+        func.count(case((RSVP.is_attending == True, RSVP.id)))
+    ).outerjoin(
+        RSVP, RSVP.party_id == Party.id
+    ).filter(Party.host_id == current_host.id).group_by(Party.id).all()
     
     # Add RSVP counts to each party
     party_responses = []
-    for party in parties:
-        rsvps = db.query(RSVP).filter(RSVP.party_id == party.id).all()
-        attending_count = sum(1 for rsvp in rsvps if rsvp.is_attending)
-        
+    for party, rsvp_count, attending_count in rows:
         party_response = PartyListResponse(
             id=party.id,
             name=party.name,
@@ -59,7 +78,7 @@ def get_host_parties(current_host: Host = Depends(get_current_host), db: Session
             invite_code=party.invite_code,
             host_id=party.host_id,
             created_at=party.created_at,
-            rsvp_count=len(rsvps),
+            rsvp_count=rsvp_count,
             attending_count=attending_count
         )
         party_responses.append(party_response)
@@ -67,7 +86,8 @@ def get_host_parties(current_host: Host = Depends(get_current_host), db: Session
     return party_responses
 
 @router.get("/{party_id}", response_model=PartyResponse)
-def get_party(party_id: int, current_host: Host = Depends(get_current_host), db: Session = Depends(get_db)):
+@session_endpoint
+def get_party(party_id: int, current_host: HostIdentity = Depends(get_current_host_identity), db: Session = Depends(get_db)):
     """Get a specific party by ID."""
     party = db.query(Party).filter(Party.id == party_id, Party.host_id == current_host.id).first()
     if not party:
@@ -78,7 +98,8 @@ def get_party(party_id: int, current_host: Host = Depends(get_current_host), db:
     return party
 
 @router.delete("/{party_id}")
-def delete_party(party_id: int, current_host: Host = Depends(get_current_host), db: Session = Depends(get_db)):
+@session_endpoint
+def delete_party(party_id: int, current_host: HostIdentity = Depends(get_current_host_identity), db: Session = Depends(get_db)):
     """Delete a party."""
     party = db.query(Party).filter(Party.id == party_id, Party.host_id == current_host.id).first()
     if not party:
@@ -87,14 +108,36 @@ def delete_party(party_id: int, current_host: Host = Depends(get_current_host),
             detail="Party not found"
         )
     
+    invite_code = party.invite_code
+    # Every ancestor of a party's RSVP belongs to the same party, so this clears
+    # all of its closure rows (SQLite doesn't enforce ON DELETE CASCADE by default)
+    db.execute(delete(RSVPClosure).where(
+        RSVPClosure.descendant_id.in_(select(RSVP.id).where(RSVP.party_id == party_id))
+    ))
     db.delete(party)
     db.commit()
+    party_cache.invalidate(invite_code)
     
     return {"message": "Party deleted successfully"}
 
 @router.get("/{party_id}/rsvps")
-def get_party_rsvps(party_id: int, current_host: Host = Depends(get_current_host), db: Session = Depends(get_db)):
-    """Get all RSVPs for a specific party."""
+@session_endpoint
+def get_party_rsvps(
+    party_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    is_attending: Optional[bool] = None,
+    degree: Optional[int] = Query(None, ge=1, le=3),
+    is_confirmed: Optional[bool] = None,
+    current_host: HostIdentity = Depends(get_current_host_identity),
+    db: Session = Depends(get_db)
+):
+    """Get all RSVPs for a specific party.
+
+    With limit set, returns one page in RSVP order; the X-Next-Cursor header
+    holds the cursor for the next page and is absent on the last one.
+    """
     # Verify party belongs to current host
     party = db.query(Party).filter(Party.id == party_id, Party.host_id == current_host.id).first()
     if not party:
@@ -103,6 +146,344 @@ def get_party_rsvps(party_id: int, current_host: Host = Depends(get_current_host
             detail="Party not found"
         )
     
-    rsvps = db.query(RSVP).filter(RSVP.party_id == party_id).all()
+    query = filter_rsvps(
+        db.query(RSVP).filter(RSVP.party_id == party_id),
+        is_attending=is_attending,
+        degree=degree,
+        is_confirmed=is_confirmed
+    )
+    rsvps, next_cursor = paginate_rsvps(query, cursor, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return rsvps
 
+# Columns available to the RSVP export, in default order
+EXPORT_COLUMNS = (
+    "id",
+    "guest_name",
+    "guest_phone",
+    "is_attending",
+    "degree",
+    "referrer_name",
+    "invited_by_rsvp_id",
+    "invitation_code",
+    "is_confirmed",
+    "has_sent_invitation",
+    "created_at",
+)
+EXPORT_BATCH_SIZE = 1000
+
+def _export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _stream_rsvp_export(party_id: int, columns: List[str], export_format: str):
+    """Yield a party's RSVPs as CSV or NDJSON chunks, one chunk per fetched batch.
+
+    Uses its own session so the rows are streamed with a server-side cursor
+    (yield_per) independently of the request's session, keeping memory constant
+    regardless of party size.
+    """
+    Referrer = aliased(RSVP)
+    stmt = select(
+        RSVP.id,
+        RSVP.guest_name,
+        RSVP.guest_phone,
+        RSVP.is_attending,
+        RSVP.degree,
+        Referrer.guest_name.label("referrer_name"),
+        RSVP.invited_by_rsvp_id,
+        RSVP.invitation_code,
+        RSVP.is_confirmed,
+        RSVP.has_sent_invitation,
+        RSVP.created_at
+    ).outerjoin(
+        Referrer, Referrer.id == RSVP.invited_by_rsvp_id
+    ).where(RSVP.party_id == party_id).order_by(RSVP.created_at, RSVP.id)
+    
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if export_format == "csv":
+        writer.writerow(columns)
+    
+    SessionLocal = get_session_local()
+    with SessionLocal() as db:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        for batch in result.partitions():
+            for row in batch:
+                record = row._mapping
+                values = [
+                    (record["referrer_name"] or "Host (1st degree)") if column == "referrer_name"
+                    else _export_value(record[column])
+                    for column in columns
+                ]
+                if export_format == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values))))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/{party_id}/rsvps/export")
+@session_endpoint
+def export_party_rsvps(
+    party_id: int,
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns to include (default: all)"),
+    current_host: HostIdentity = Depends(get_current_host_identity),
+    db: Session = Depends(get_db)
+):
+    """Stream all RSVPs for a party as CSV or NDJSON, with referrer names and degree."""
+    # Verify party belongs to current host
+    party = db.query(Party.id).filter(Party.id == party_id, Party.host_id == current_host.id).first()
+    if not party:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Party not found"
+        )
+    # The stream reads on its own session; don't hold this one's connection while it runs
+    db.close()
+    
+    selected_columns = list(EXPORT_COLUMNS)
+    if columns:
+        selected_columns = [column.strip() for column in columns.split(",") if column.strip()]
+        unknown_columns = [column for column in selected_columns if column not in EXPORT_COLUMNS]
+        if unknown_columns or not selected_columns:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown export columns: {', '.join(unknown_columns)}. Available: {', '.join(EXPORT_COLUMNS)}"
+            )
+    
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _stream_rsvp_export(party_id, selected_columns, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="party-{party_id}-rsvps.{export_format}"'}
+    )
+
+IMPORT_BATCH_SIZE = 1000
+
+def _insert_imported_guests(db: Session, party_id: int, guests: List[dict]) -> dict:
+    """Bulk insert 1st-degree RSVPs in batches and return {phone: rsvp id} for the rows created.
+
+    Invitation codes are generated up front and the unique indexes decide: rows
+    skipped by ON CONFLICT DO NOTHING are retried with fresh codes, unless the
+    guest's phone was inserted for this party concurrently.
+    """
+    rsvps = RSVP.__table__
+    insert = dialect_insert(db, rsvps)
+    created = {}
+    pending = guests
+    
+    for _ in range(MAX_CODE_ATTEMPTS):
+        values = [
+            {
+                **guest,
+                "party_id": party_id,
+                "degree": 1,
+                "invited_by_rsvp_id": None,
+                "invitation_code": generate_rsvp_invitation_code() if guest["is_attending"] else None,
+                "is_confirmed": False,
+                "has_sent_invitation": False
+            }
+            for guest in pending
+        ]
+        for start in range(0, len(values), IMPORT_BATCH_SIZE):
+            batch = values[start:start + IMPORT_BATCH_SIZE]
+            if insert is None:
+                db.execute(rsvps.insert(), batch)
+                continue
+            result = db.execute(
+                insert.on_conflict_do_nothing().returning(rsvps.c.id, rsvps.c.guest_phone),
+                batch
+            )
+            created.update((row.guest_phone, row.id) for row in result)
+        
+        if insert is None:
+            phones = [guest["guest_phone"] for guest in pending]
+            created.update(db.query(RSVP.guest_phone, RSVP.id).filter(
+                RSVP.party_id == party_id, RSVP.guest_phone.in_(phones)
+            ).all())
+            return created
+        
+        skipped = [guest for guest in pending if guest["guest_phone"] not in created]
+        if not skipped:
+            return created
+        taken = {
+            phone for (phone,) in db.query(RSVP.guest_phone).filter(
+                RSVP.party_id == party_id,
+                RSVP.guest_phone.in_([guest["guest_phone"] for guest in skipped])
+            )
+        }
+        pending = [guest for guest in skipped if guest["guest_phone"] not in taken]
+        if not pending:
+            return created
+    
+    raise CodeAllocationError(f"Could not allocate unique invitation codes after {MAX_CODE_ATTEMPTS} attempts")
+
+def _find_host_party(db: Session, party_id: int, host_id: int):
+    """The party's id and version if it belongs to the host; raises 404 otherwise."""
+    party = db.query(Party.id, Party.version).filter(Party.id == party_id, Party.host_id == host_id).first()
+    if not party:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Party not found"
+        )
+    return party
+
+def _find_host_party_and_release(db: Session, party_id: int, host_id: int):
+    """_find_host_party, then close the session so its connection is free during the request's threadpool work.
+
+    Closing in the same call matters in sync mode: a connection held between
+    threadpool calls can't be released while every thread waits on the pool.
+    """
+    party = _find_host_party(db, party_id, host_id)
+    db.close()
+    return party
+
+def _get_party_phones(db: Session, party_id: int) -> set:
+    """The phones already RSVPed to the party; releases the connection before the upload is planned."""
+    phones = {phone for (phone,) in db.query(RSVP.guest_phone).filter(RSVP.party_id == party_id)}
+    db.close()
+    return phones
+
+def _plan_guest_import(records: List[dict], existing_phones: set):
+    """Normalize and deduplicate uploaded rows; returns the per-row report and the guests to insert."""
+    report = []
+    guests = []
+    seen_phones = set()
+    for row_number, record in enumerate(records, start=1):
+        guest, error = normalize_guest(record)
+        if error:
+            report.append({"row": row_number, "status": "invalid", "detail": error})
+            continue
+        
+        entry = {"row": row_number, "guest_name": guest["guest_name"], "guest_phone": guest["guest_phone"]}
+        if guest["guest_phone"] in seen_phones:
+            entry.update(status="duplicate", detail="Phone number appears earlier in this upload")
+        elif guest["guest_phone"] in existing_phones:
+            entry.update(status="exists", detail="Guest already has an RSVP for this party")
+        else:
+            entry["status"] = "created"
+            guests.append(guest)
+        seen_phones.add(guest["guest_phone"])
+        report.append(entry)
+    return report, guests
+
+def _store_imported_guests(db: Session, party_id: int, guests: List[dict]) -> dict:
+    """Insert the guests with their closure rows and commit; returns {phone: rsvp id} for the rows created."""
+    created = _insert_imported_guests(db, party_id, guests) if guests else {}
+    if created:
+        add_root_closure_rows(created.values(), db)
+        bump_party_version(party_id, db)
+    db.commit()
+    return created
+
+def _encode_import_report(report: List[dict], created: dict) -> bytes:
+    for entry in report:
+        if entry["status"] != "created":
+            continue
+        rsvp_id = created.get(entry["guest_phone"])
+        if rsvp_id is None:
+            entry.update(status="exists", detail="Guest RSVPed while the import was running")
+        else:
+            entry["rsvp_id"] = rsvp_id
+    
+    created_count = sum(1 for entry in report if entry["status"] == "created")
+    return RSVPImportResponse(
+        created=created_count,
+        skipped=len(report) - created_count,
+        rows=report
+    ).model_dump_json().encode()
+
+@router.post("/{party_id}/rsvps/import", response_model=RSVPImportResponse)
+async def import_party_rsvps(
+    party_id: int,
+    file: UploadFile = File(..., description="CSV with a header row, or a JSON array of guests"),
+    current_host: HostIdentity = Depends(get_current_host_identity),
+    db: Session = Depends(get_session)
+):
+    """Import a guest list as 1st-degree RSVPs, reporting the outcome of every row.
+    
+    Phones are normalized and deduplicated within the upload and against the
+    party's existing RSVPs; existing RSVPs are left untouched. Reading, parsing
+    and reporting on the upload run in the threadpool, and only the database
+    work goes through the session, so a large import doesn't hold up the event
+    loop in async mode. The session's connection is released before each of
+    those threadpool hops, and the final commit returns it for the encoding.
+    """
+    await run_in_session(db, _find_host_party_and_release, party_id, current_host.id)
+    
+    content = await file.read()
+    try:
+        records = await run_in_threadpool(parse_guest_upload, content, file.filename, file.content_type)
+    except GuestImportError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    existing_phones = await run_in_session(db, _get_party_phones, party_id)
+    report, guests = await run_in_threadpool(_plan_guest_import, records, existing_phones)
+    created = await run_in_session(db, _store_imported_guests, party_id, guests)
+    if created:
+        event_broker.publish(party_channel(party_id), {"type": "rsvp.imported", "count": len(created)})
+    
+    content = await run_in_threadpool(_encode_import_report, report, created)
+    return Response(content=content, media_type="application/json")
+
+def _load_invitation_tree(party_id: int) -> bytes:
+    """Fetch a party's RSVPs in one query and serialize them as a nested tree.
+    
+    Uses its own short-lived session: it runs in the threadpool, where the
+    request's session (an AsyncSession in async mode) can't be used.
+    """
+    with get_session_local()() as db:
+        rows = db.query(
+            RSVP.id,
+            RSVP.invited_by_rsvp_id,
+            RSVP.guest_name,
+            RSVP.degree,
+            RSVP.is_attending,
+            RSVP.is_confirmed
+        ).filter(RSVP.party_id == party_id).order_by(RSVP.id).all()
+    
+    children = build_invitation_tree(rows)
+    tree = {
+        "party_id": party_id,
+        "size": len(rows),
+        "confirmed_count": sum(1 for row in rows if row.is_confirmed),
+        "children": children
+    }
+    return json.dumps(tree, separators=(",", ":")).encode()
+
+@router.get("/{party_id}/tree", response_model=InvitationTreeResponse)
+async def get_party_tree(
+    party_id: int,
+    if_none_match: Optional[str] = Header(None),
+    current_host: HostIdentity = Depends(get_current_host_identity),
+    db: Session = Depends(get_session)
+):
+    """Get the party's whole invitation tree, with subtree sizes and confirmation state per guest.
+
+    The serialized tree is cached per party version, so any RSVP write (in any
+    worker) moves readers to a fresh build; the version also serves as the ETag.
+    Building a large tree is CPU-bound, so cache misses are built in the
+    threadpool rather than on the event loop.
+    """
+    party = await run_in_session(db, _find_host_party_and_release, party_id, current_host.id)
+    
+    headers = {"ETag": party_etag(party.id, party.version), "Cache-Control": "no-cache"}
+    if etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    content = await run_in_threadpool(
+        tree_cache.get_or_load, (party.id, party.version), lambda: _load_invitation_tree(party_id)
+    )
+    return Response(content=content, media_type="application/json", headers=headers)
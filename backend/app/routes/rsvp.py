@@ -1,19 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import case, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, contains_eager
+from pydantic import TypeAdapter
+from typing import List, Optional
+import asyncio
+import os
 
-from app.database import get_db
+from app.database import get_db, get_session, get_session_local, insert_or_none, run_in_session, session_endpoint
 from app.models.party import Party
 from app.models.rsvp import RSVP
-from app.schemas import RSVPCreate, RSVPResponse, PartyResponse, RSVPInviteRequest, RSVPInviteResponse
+from app.models.rsvp_closure import RSVPClosure
+from app.schemas import (
+    DownstreamAcceptance, GuestRSVPResponse, PartyRSVPResponse, RSVPCreate, RSVPCreateResponse,
+    PartyResponse, RSVPInviteRequest, RSVPInviteResponse
+)
 from app.utils.helpers import format_phone_number, generate_rsvp_invitation_code
+from app.utils.codes import allocate_unique_code
+from app.utils.cache import party_cache
+from app.utils.closure import add_closure_rows
+from app.utils.events import event_broker, party_channel
+from app.utils.pagination import MAX_PAGE_SIZE, filter_rsvps, paginate_rsvps
+from app.utils.versions import bump_party_version, check_party_etag
 
 router = APIRouter()
 
-@router.get("/party/{invite_code}", response_model=PartyResponse)
-def get_party_by_invite_code(invite_code: str, db: Session = Depends(get_db)):
-    """Get party information by invite code (for guests)."""
-    party = db.query(Party).filter(Party.invite_code == invite_code).first()
+# Seconds between keep-alive comments on idle event streams, and the client's reconnect delay
+SSE_HEARTBEAT_INTERVAL = float(os.getenv("SSE_HEARTBEAT_INTERVAL", "15"))
+SSE_RETRY_MS = 3000
+
+# Serializers compiled once at import. List endpoints encode their models to
+# JSON bytes in one pass instead of going through jsonable_encoder; their
+# response_model stays on the route for the OpenAPI schema.
+guest_rsvps_adapter = TypeAdapter(List[GuestRSVPResponse])
+party_rsvps_adapter = TypeAdapter(List[PartyRSVPResponse])
+
+def json_response(content: bytes, response: Optional[Response] = None) -> Response:
+    """Wrap pre-encoded JSON, keeping headers already set on the endpoint's injected response."""
+    headers = dict(response.headers) if response is not None else None
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def get_party_or_404(invite_code: str, db: Session) -> PartyResponse:
+    """Look up a party by invite code through the party cache, raising 404 if it doesn't exist."""
+    def load_party():
+        party = db.query(Party).filter(Party.invite_code == invite_code).first()
+        return PartyResponse.model_validate(party) if party else None
+    
+    party = party_cache.get_or_load(invite_code, load_party)
     if not party:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -21,27 +56,165 @@ def get_party_by_invite_code(invite_code: str, db: Session = Depends(get_db)):
         )
     return party
 
-def confirm_rsvp_chain(rsvp: RSVP, db: Session):
-    """Confirm RSVP and propagate confirmation up the chain."""
+def _party_gone(invite_code: str) -> HTTPException:
+    """Drop a cached party found to be deleted, and the 404 to raise for it."""
+    party_cache.invalidate(invite_code)
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Party not found"
+    )
+
+@router.get("/party/{invite_code}", response_model=PartyResponse)
+@session_endpoint
+def get_party_by_invite_code(
+    invite_code: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get party information by invite code (for guests)."""
+    return check_party_etag(invite_code, if_none_match, response, db)
+
+@router.get("/party/{invite_code}/events")
+async def stream_party_events(invite_code: str):
+    """Stream the party's RSVP events (created, updated, confirmed) as Server-Sent Events.
+
+    Replaces polling the RSVP lists: clients refetch once on connect, then apply
+    events. A comment line is sent every SSE_HEARTBEAT_INTERVAL seconds to keep
+    proxies from closing idle streams; a client that falls too far behind has
+    its stream closed and should reconnect and refetch.
+    """
+    def load_party():
+        # A short-lived session: a dependency's session would stay open for the whole stream
+        db = get_session_local()()
+        try:
+            return get_party_or_404(invite_code, db)
+        finally:
+            db.close()
+    
+    party = await run_in_threadpool(load_party)
+    
+    async def stream():
+        async with event_broker.subscribe(party_channel(party.id)) as events:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(events.get(), SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    break
+                yield f"data: {message}\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def confirm_rsvp_chain(rsvp: RSVP, db: Session) -> List[int]:
+    """Confirm RSVP and propagate confirmation up the chain.
+
+    The inviter chain is read from rsvp_closure, an indexed lookup on the RSVP's
+    ancestor rows, and confirmed in a single UPDATE. The unconfirmed ancestors
+    are locked in id order before being updated, and rows another request
+    already confirmed are skipped rather than rewritten. The locks are FOR NO
+    KEY UPDATE: earlier in the same transaction the RSVP and closure inserts'
+    foreign key checks took FOR KEY SHARE locks on these ancestors, and FOR
+    UPDATE would wait on every other request's key-share locks, deadlocking
+    concurrent confirmations under a shared inviter.
+    Nothing is committed here; the caller owns the transaction. Returns the
+    ids of the rows that were newly confirmed.
+    """
+    chain = select(RSVPClosure.ancestor_id).where(RSVPClosure.descendant_id == rsvp.id)
+    
+    # FOR NO KEY UPDATE in ascending id order (ancestors are older, so lower
+    # ids); ignored on SQLite, which serializes writers anyway
+    unconfirmed = select(RSVP.id).where(
+        RSVP.id.in_(chain),
+        RSVP.is_confirmed == False
+    ).order_by(RSVP.id).with_for_update(key_share=True)
+
+    if db.get_bind().dialect.update_returning:
+        confirmed_ids = db.scalars(
+            update(RSVP)
+            .where(RSVP.id.in_(unconfirmed))
+            .values(is_confirmed=True)
+            .returning(RSVP.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+    else:
+        confirmed_ids = db.scalars(unconfirmed).all()
+        if confirmed_ids:
+            db.execute(
+                update(RSVP)
+                .where(RSVP.id.in_(confirmed_ids))
+                .values(is_confirmed=True)
+                .execution_options(synchronize_session=False)
+            )
     rsvp.is_confirmed = True
-    db.commit()
+    return list(confirmed_ids)
+
+def upsert_rsvp(values: dict, db: Session):
+    """Insert an RSVP, or update the name and attendance of the guest's existing one.
+
+    Relies on the unique indexes instead of probing first: a new RSVP is a single
+    INSERT ... ON CONFLICT DO NOTHING RETURNING, and a conflicting insert falls
+    through to one UPDATE of the guest's row for this party. Returns the RSVP and
+    whether it was created, or None if the invitation code collided with another
+    RSVP's and the caller should retry with a new one.
+    """
+    rsvp = insert_or_none(db, RSVP, values)
+    if rsvp is not None:
+        return rsvp, True
     
-    # If this RSVP was invited by someone, confirm them too
-    if rsvp.invited_by_rsvp_id:
-        inviter = db.query(RSVP).filter(RSVP.id == rsvp.invited_by_rsvp_id).first()
-        if inviter and not inviter.is_confirmed:
-            confirm_rsvp_chain(inviter, db)
+    rsvp = update_rsvp(values, db)
+    if rsvp is None:
+        return None
+    return rsvp, False
 
-@router.post("/party/{invite_code}/rsvp", response_model=RSVPResponse)
+def update_rsvp(values: dict, db: Session) -> Optional[RSVP]:
+    """Update the name and attendance of the guest's RSVP for the party; returns it, or None if they have none."""
+    existing_filter = (
+        RSVP.party_id == values["party_id"],
+        RSVP.guest_phone == values["guest_phone"]
+    )
+    changes = {
+        "guest_name": values["guest_name"],
+        "is_attending": values["is_attending"]
+    }
+    
+    if db.get_bind().dialect.update_returning:
+        rsvp = db.scalars(
+            update(RSVP).where(*existing_filter).values(**changes).returning(RSVP),
+            execution_options={"populate_existing": True, "synchronize_session": False}
+        ).first()
+    else:
+        rsvp = db.query(RSVP).filter(*existing_filter).first()
+        if rsvp is not None:
+            for key, value in changes.items():
+                setattr(rsvp, key, value)
+            db.flush()
+    return rsvp
+
+# RSVP fields pushed to party event streams. The streams are public, like the
+# guest list, so a guest who declined is sent without their name.
+RSVP_EVENT_FIELDS = {"id", "guest_name", "degree", "invited_by_rsvp_id", "is_attending", "is_confirmed", "created_at"}
+DECLINED_RSVP_EVENT_FIELDS = RSVP_EVENT_FIELDS - {"guest_name"}
+
+@router.post("/party/{invite_code}/rsvp", response_model=RSVPCreateResponse)
+@session_endpoint
 def create_rsvp(invite_code: str, rsvp_data: RSVPCreate, db: Session = Depends(get_db)):
-    """Create an RSVP for a party using invite code with Kevin Bacon rule."""
+    """Create an RSVP for a party using invite code with Kevin Bacon rule.
+
+    The whole workflow (upsert, degree resolution, code allocation and chain
+    confirmation) is one transaction with a single commit; rows written along
+    the way come back through RETURNING, so nothing is re-read. If the request
+    fails before the commit, closing the session rolls everything back.
+    """
     # Find party by invite code
-    party = db.query(Party).filter(Party.invite_code == invite_code).first()
-    if not party:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Party not found"
-        )
+    party = get_party_or_404(invite_code, db)
     
     # Format phone number
     phone = format_phone_number(rsvp_data.guest_phone)
@@ -51,84 +224,103 @@ def create_rsvp(invite_code: str, rsvp_data: RSVPCreate, db: Session = Depends(g
             detail="Phone number must be 10 digits"
         )
     
-    # Check if RSVP already exists for this phone number and party
-    existing_rsvp = db.query(RSVP).filter(
-        RSVP.party_id == party.id,
-        RSVP.guest_phone == phone
-    ).first()
-    
-    if existing_rsvp:
-        # Update existing RSVP
-        existing_rsvp.guest_name = rsvp_data.guest_name
-        existing_rsvp.is_attending = rsvp_data.is_attending
-        db.commit()
-        db.refresh(existing_rsvp)
-        return existing_rsvp
-    
     # Determine degree and inviter
     degree = 1
     invited_by_rsvp_id = None
+    inviter_error = None
     
     if rsvp_data.invited_by_code:
         # Find the RSVP that sent this invitation
-        inviter_rsvp = db.query(RSVP).filter(
+        inviter_rsvp = db.query(RSVP.id, RSVP.degree).filter(
             RSVP.invitation_code == rsvp_data.invited_by_code,
             RSVP.party_id == party.id
         ).first()
         
         if not inviter_rsvp:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid invitation code"
-            )
-        
-        if inviter_rsvp.degree >= 3:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Cannot invite beyond 3rd degree"
-            )
-        
-        degree = inviter_rsvp.degree + 1
-        invited_by_rsvp_id = inviter_rsvp.id
+            inviter_error = "Invalid invitation code"
+        elif inviter_rsvp.degree >= 3:
+            inviter_error = "Cannot invite beyond 3rd degree"
+        else:
+            degree = inviter_rsvp.degree + 1
+            invited_by_rsvp_id = inviter_rsvp.id
     
     # Create new RSVP
-    invitation_code = None
+    generate_code = lambda: None
     is_confirmed = False
     
     if degree < 3 and rsvp_data.is_attending:
         # Generate invitation code for 1st and 2nd degree attendees
-        invitation_code = generate_rsvp_invitation_code()
-        # Ensure uniqueness
-        while db.query(RSVP).filter(RSVP.invitation_code == invitation_code).first():
-            invitation_code = generate_rsvp_invitation_code()
+        generate_code = generate_rsvp_invitation_code
     elif degree == 3 and rsvp_data.is_attending:
         # 3rd degree attendees are automatically confirmed
         is_confirmed = True
     
-    rsvp = RSVP(
-        guest_name=rsvp_data.guest_name,
-        guest_phone=phone,
-        is_attending=rsvp_data.is_attending,
-        party_id=party.id,
-        degree=degree,
-        invited_by_rsvp_id=invited_by_rsvp_id,
-        invitation_code=invitation_code,
-        is_confirmed=is_confirmed,
-        has_sent_invitation=False
-    )
+    values = {
+        "guest_name": rsvp_data.guest_name,
+        "guest_phone": phone,
+        "is_attending": rsvp_data.is_attending,
+        "party_id": party.id,
+        "degree": degree,
+        "invited_by_rsvp_id": invited_by_rsvp_id,
+        "is_confirmed": is_confirmed,
+        "has_sent_invitation": False
+    }
     
-    db.add(rsvp)
-    db.commit()
-    db.refresh(rsvp)
+    if inviter_error:
+        # The inviter only matters for a new RSVP: a guest who already has one
+        # still updates it with a stale or invalid invitation code
+        rsvp = update_rsvp(values, db)
+        if rsvp is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=inviter_error
+            )
+        created = False
+    else:
+        # Insert the RSVP, or update the guest's existing RSVP for this party;
+        # invitation code uniqueness is enforced by the unique index
+        try:
+            rsvp, created = allocate_unique_code(
+                lambda code: upsert_rsvp({**values, "invitation_code": code}, db),
+                generate_code
+            )
+        except IntegrityError:
+            # ON CONFLICT doesn't cover the party foreign key: the cached party was deleted
+            raise _party_gone(invite_code)
     
-    # If this is a 3rd degree RSVP, confirm the chain
-    if degree == 3 and rsvp_data.is_attending:
-        confirm_rsvp_chain(rsvp, db)
-        db.refresh(rsvp)
+    if created:
+        add_closure_rows(rsvp.id, invited_by_rsvp_id, db)
     
-    return rsvp
+    # If this is a new 3rd degree RSVP, confirm the chain in the same transaction
+    confirmed_ids = []
+    if created and degree == 3 and rsvp_data.is_attending:
+        confirmed_ids = confirm_rsvp_chain(rsvp, db)
+    
+    # Build the response before committing so the commit doesn't expire the
+    # RSVP and force a reload
+    response = RSVPCreateResponse.model_validate(rsvp)
+    response.chain_confirmed_count = len(confirmed_ids)
+    
+    # The party came from the cache; another worker may have deleted it since.
+    # Nothing is committed if it is gone (SQLite doesn't enforce the foreign key)
+    if not bump_party_version(party.id, db):
+        raise _party_gone(invite_code)
+    db.commit()
+    
+    # Notify live party pages; payloads never include phone numbers or invitation codes
+    channel = party_channel(party.id)
+    event_broker.publish(channel, {
+        "type": "rsvp.created" if created else "rsvp.updated",
+        "rsvp": response.model_dump(
+            mode="json", include=RSVP_EVENT_FIELDS if response.is_attending else DECLINED_RSVP_EVENT_FIELDS
+        )
+    })
+    if confirmed_ids:
+        event_broker.publish(channel, {"type": "rsvp.confirmed", "rsvp_ids": confirmed_ids})
+    return response
 
 @router.get("/rsvp/{rsvp_id}")
+@session_endpoint
 def get_rsvp_details(rsvp_id: int, db: Session = Depends(get_db)):
     """Get RSVP details including invitation information."""
     rsvp = db.query(RSVP).filter(RSVP.id == rsvp_id).first()
@@ -145,27 +337,47 @@ def get_rsvp_details(rsvp_id: int, db: Session = Depends(get_db)):
         "needs_invitation": rsvp.degree < 3 and rsvp.is_attending and not rsvp.is_confirmed
     }
 
-def get_first_downstream_acceptance(rsvp: RSVP, db: Session):
-    """Find the immediate downstream person who was directly invited by this RSVP."""
-    if not rsvp.invitation_code or not rsvp.is_confirmed:
-        return None
+def get_first_downstream_acceptances(rsvps: List[RSVP], db: Session) -> dict:
+    """Find the first attending direct invitee of each confirmed RSVP in one query.
+
+    Returns a mapping of RSVP id to DownstreamAcceptance; RSVPs without an
+    accepted invitation are left out.
+    """
+    inviter_ids = [rsvp.id for rsvp in rsvps if rsvp.invitation_code and rsvp.is_confirmed]
+    if not inviter_ids:
+        return {}
     
-    # Find the first RSVP that was directly invited by this RSVP (immediate downstream)
-    # Since this RSVP is confirmed, at least one person they invited must have completed the chain
-    immediate_downstream = db.query(RSVP).filter(
-        RSVP.invited_by_rsvp_id == rsvp.id,
+    # Rank each inviter's attending invitees by RSVP time and keep the first one
+    ranked = select(
+        RSVP.invited_by_rsvp_id,
+        RSVP.guest_name,
+        RSVP.guest_phone,
+        func.row_number().over(
+            partition_by=RSVP.invited_by_rsvp_id,
+            order_by=(RSVP.created_at, RSVP.id)
+        ).label("position")
+    ).where(
+        RSVP.invited_by_rsvp_id.in_(inviter_ids),
         RSVP.is_attending == True
-    ).order_by(RSVP.created_at).first()
+    ).subquery()
     
-    if immediate_downstream:
-        return {
-            "name": immediate_downstream.guest_name,
-            "phone": immediate_downstream.guest_phone
-        }
+    rows = db.execute(
+        select(ranked.c.invited_by_rsvp_id, ranked.c.guest_name, ranked.c.guest_phone)
+        .where(ranked.c.position == 1)
+    )
     
-    return None
+    return {
+        row.invited_by_rsvp_id: DownstreamAcceptance(name=row.guest_name, phone=row.guest_phone)
+        for row in rows
+    }
+
+def get_first_downstream_acceptance(rsvp: RSVP, db: Session):
+    """Find the immediate downstream person who was directly invited by this RSVP."""
+    # Since this RSVP is confirmed, at least one person they invited must have completed the chain
+    return get_first_downstream_acceptances([rsvp], db).get(rsvp.id)
 
-@router.get("/guest/{phone}/rsvps")
+@router.get("/guest/{phone}/rsvps", response_model=List[GuestRSVPResponse])
+@session_endpoint
 def get_guest_rsvps(phone: str, db: Session = Depends(get_db)):
     """Get all RSVPs for a specific guest by phone number, with party info and first downstream acceptance."""
     # Format phone number
@@ -176,44 +388,30 @@ def get_guest_rsvps(phone: str, db: Session = Depends(get_db)):
             detail="Phone number must be 10 digits"
         )
     
-    rsvps = db.query(RSVP).filter(RSVP.guest_phone == formatted_phone).all()
+    # Load RSVPs with their parties in one query, then all downstream acceptances in another
+    rsvps = db.query(RSVP).outerjoin(RSVP.party).options(contains_eager(RSVP.party)).filter(
+        RSVP.guest_phone == formatted_phone
+    ).all()
+    first_downstreams = get_first_downstream_acceptances(rsvps, db)
     
     # Include party information and first downstream acceptance for each RSVP
     rsvps_with_parties = []
     for rsvp in rsvps:
-        party = db.query(Party).filter(Party.id == rsvp.party_id).first()
-        first_downstream = get_first_downstream_acceptance(rsvp, db) if rsvp.is_confirmed else None
-        
-        rsvp_dict = {
-            "id": rsvp.id,
-            "guest_name": rsvp.guest_name,
-            "guest_phone": rsvp.guest_phone,
-            "is_attending": rsvp.is_attending,
-            "party_id": rsvp.party_id,
-            "degree": rsvp.degree,
-            "invited_by_rsvp_id": rsvp.invited_by_rsvp_id,
-            "invitation_code": rsvp.invitation_code,
-            "is_confirmed": rsvp.is_confirmed,
-            "has_sent_invitation": rsvp.has_sent_invitation,
-            "created_at": rsvp.created_at.isoformat(),
-            "party": {
-                "id": party.id,
-                "name": party.name,
-                "start_time": party.start_time.isoformat(),
-                "location": party.location,
-                "description": party.description,
-                "invite_code": party.invite_code,
-                "host_id": party.host_id,
-                "created_at": party.created_at.isoformat()
-            } if party else None,
-            "first_downstream_acceptance": first_downstream
-        }
-        rsvps_with_parties.append(rsvp_dict)
+        rsvp_response = GuestRSVPResponse.model_validate(rsvp)
+        rsvp_response.first_downstream_acceptance = first_downstreams.get(rsvp.id)
+        rsvps_with_parties.append(rsvp_response)
     
-    return rsvps_with_parties
+    return json_response(guest_rsvps_adapter.dump_json(rsvps_with_parties))
 
-@router.get("/guest/{phone}/party/{invite_code}")
-def get_guest_party_rsvp(phone: str, invite_code: str, db: Session = Depends(get_db)):
+@router.get("/guest/{phone}/party/{invite_code}", response_model=GuestRSVPResponse)
+@session_endpoint
+def get_guest_party_rsvp(
+    phone: str,
+    invite_code: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """Get a specific guest's RSVP for a specific party with first downstream acceptance."""
     # Format phone number
     formatted_phone = format_phone_number(phone)
@@ -223,17 +421,12 @@ def get_guest_party_rsvp(phone: str, invite_code: str, db: Session = Depends(get
             detail="Phone number must be 10 digits"
         )
     
-    # Find party by invite code
-    party = db.query(Party).filter(Party.invite_code == invite_code).first()
-    if not party:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Party not found"
-        )
+    # Unchanged since the client's copy: answer 304 before touching any RSVPs
+    party_id = check_party_etag(invite_code, if_none_match, response, db).id
     
-    # Find RSVP for this phone and party
-    rsvp = db.query(RSVP).filter(
-        RSVP.party_id == party.id,
+    # Find RSVP for this phone and party, with the party from the same query
+    rsvp = db.query(RSVP).join(RSVP.party).options(contains_eager(RSVP.party)).filter(
+        RSVP.party_id == party_id,
         RSVP.guest_phone == formatted_phone
     ).first()
     
@@ -244,99 +437,105 @@ def get_guest_party_rsvp(phone: str, invite_code: str, db: Session = Depends(get
         )
     
     # Get first downstream acceptance if confirmed
-    first_downstream = get_first_downstream_acceptance(rsvp, db) if rsvp.is_confirmed else None
+    rsvp_response = GuestRSVPResponse.model_validate(rsvp)
+    if rsvp.is_confirmed:
+        rsvp_response.first_downstream_acceptance = get_first_downstream_acceptance(rsvp, db)
     
-    return {
-        "id": rsvp.id,
-        "guest_name": rsvp.guest_name,
-        "guest_phone": rsvp.guest_phone,
-        "is_attending": rsvp.is_attending,
-        "party_id": rsvp.party_id,
-        "degree": rsvp.degree,
-        "invited_by_rsvp_id": rsvp.invited_by_rsvp_id,
-        "invitation_code": rsvp.invitation_code,
-        "is_confirmed": rsvp.is_confirmed,
-        "has_sent_invitation": rsvp.has_sent_invitation,
-        "created_at": rsvp.created_at.isoformat(),
-        "party": {
-            "id": party.id,
-            "name": party.name,
-            "start_time": party.start_time.isoformat(),
-            "location": party.location,
-            "description": party.description,
-            "invite_code": party.invite_code,
-            "host_id": party.host_id,
-            "created_at": party.created_at.isoformat()
-        },
-        "first_downstream_acceptance": first_downstream
-    }
+    return json_response(rsvp_response.model_dump_json().encode(), response)
 
-@router.get("/party/{invite_code}/rsvps/all")
-def get_party_rsvps_all(invite_code: str, db: Session = Depends(get_db)):
-    """Get all RSVPs for a party (for hosts to see detailed info)."""
-    # Find party by invite code
-    party = db.query(Party).filter(Party.invite_code == invite_code).first()
-    if not party:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Party not found"
-        )
+def _fetch_party_rsvps_all(db: Session, invite_code: str, cursor: Optional[str], limit: Optional[int], filters: dict):
+    """One page of a party's RSVPs as rows, with referrer names, and the next page's cursor.
+
+    Closes the session before returning, so its connection is back in the pool
+    while the rows are encoded in the threadpool (see _find_host_party_and_release
+    in app.routes.parties).
+    """
+    party = get_party_or_404(invite_code, db)
     
-    rsvps = db.query(RSVP).filter(RSVP.party_id == party.id).all()
+    # Resolve referrer names with a self-join instead of one lookup per RSVP,
+    # selecting columns so no ORM objects are built
+    Referrer = aliased(RSVP)
+    query = db.query(
+        *RSVP.__table__.columns,
+        func.coalesce(Referrer.guest_name, "Host (1st degree)").label("referrer_name")
+    ).outerjoin(
+        Referrer, Referrer.id == RSVP.invited_by_rsvp_id
+    ).filter(RSVP.party_id == party.id)
+    query = filter_rsvps(query, **filters)
+    rows, next_cursor = paginate_rsvps(query, cursor, limit)
+    db.close()
+    return rows, next_cursor
+
+def _encode_party_rsvps(rows) -> bytes:
+    return party_rsvps_adapter.dump_json(party_rsvps_adapter.validate_python(rows, from_attributes=True))
+
+@router.get("/party/{invite_code}/rsvps/all", response_model=List[PartyRSVPResponse])
+async def get_party_rsvps_all(
+    invite_code: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    is_attending: Optional[bool] = None,
+    degree: Optional[int] = Query(None, ge=1, le=3),
+    is_confirmed: Optional[bool] = None,
+    db: Session = Depends(get_session)
+):
+    """Get all RSVPs for a party (for hosts to see detailed info).
     
-    # Include referrer names
-    rsvps_with_referrers = []
-    for rsvp in rsvps:
-        referrer_name = "Host (1st degree)"
-        if rsvp.invited_by_rsvp_id:
-            referrer = db.query(RSVP).filter(RSVP.id == rsvp.invited_by_rsvp_id).first()
-            if referrer:
-                referrer_name = referrer.guest_name
-        
-        rsvp_dict = {
-            "id": rsvp.id,
-            "guest_name": rsvp.guest_name,
-            "guest_phone": rsvp.guest_phone,
-            "is_attending": rsvp.is_attending,
-            "party_id": rsvp.party_id,
-            "degree": rsvp.degree,
-            "invited_by_rsvp_id": rsvp.invited_by_rsvp_id,
-            "invitation_code": rsvp.invitation_code,
-            "is_confirmed": rsvp.is_confirmed,
-            "has_sent_invitation": rsvp.has_sent_invitation,
-            "created_at": rsvp.created_at.isoformat(),
-            "referrer_name": referrer_name
-        }
-        rsvps_with_referrers.append(rsvp_dict)
+    With limit set, returns one page in RSVP order; the X-Next-Cursor header
+    holds the cursor for the next page and is absent on the last one.
+    """
+    filters = {"is_attending": is_attending, "degree": degree, "is_confirmed": is_confirmed}
+    rows, next_cursor = await run_in_session(db, _fetch_party_rsvps_all, invite_code, cursor, limit, filters)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     
-    return rsvps_with_referrers
+    # Validating and encoding an unpaged party is CPU-bound; keep it off the event loop
+    content = await run_in_threadpool(_encode_party_rsvps, rows)
+    return json_response(content, response)
 
 @router.get("/party/{invite_code}/rsvps")
-def get_party_rsvps_public(invite_code: str, db: Session = Depends(get_db)):
-    """Get all RSVPs for a party (public endpoint for guests to see who's coming)."""
-    # Find party by invite code
-    party = db.query(Party).filter(Party.invite_code == invite_code).first()
-    if not party:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Party not found"
-        )
+@session_endpoint
+def get_party_rsvps_public(
+    invite_code: str,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
+    """Get all RSVPs for a party (public endpoint for guests to see who's coming).
+
+    Counts come from one aggregate query; attending guests can be paged with
+    limit and the returned next_cursor. Conditional requests are answered with
+    304 from the party version alone.
+    """
+    # The version lookup loads the party too
+    party = check_party_etag(invite_code, if_none_match, response, db)
     
-    rsvps = db.query(RSVP).filter(RSVP.party_id == party.id).all()
+    total_rsvps, attending_count = db.query(
+        func.count(RSVP.id),
+        func.count(case((RSVP.is_attending == True, RSVP.id)))
+    ).filter(RSVP.party_id == party.id).one()
     
     # Return only attending guests for privacy
+    query = db.query(RSVP.id, RSVP.guest_name).filter(
+        RSVP.party_id == party.id,
+        RSVP.is_attending == True
+    )
+    rows, next_cursor = paginate_rsvps(query, cursor, limit)
     attending_guests = [
         {
-            "guest_name": rsvp.guest_name,
-            "is_attending": rsvp.is_attending
+            "guest_name": row.guest_name,
+            "is_attending": True
         }
-        for rsvp in rsvps
-        if rsvp.is_attending
+        for row in rows
     ]
     
     return {
         "party_name": party.name,
-        "attending_count": len(attending_guests),
-        "total_rsvps": len(rsvps),
-        "attending_guests": attending_guests
+        "attending_count": attending_count,
+        "total_rsvps": total_rsvps,
+        "attending_guests": attending_guests,
+        "next_cursor": next_cursor
     }
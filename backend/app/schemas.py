@@ -25,6 +25,11 @@ class HostResponse(HostBase):
     class Config:
         from_attributes = True
 
+class HostIdentity(BaseModel):
+    """Authenticated host as carried by the access token."""
+    id: int
+    phone: str
+
 # Party schemas
 class PartyBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=200)
@@ -70,6 +75,40 @@ class RSVPResponse(RSVPBase):
     class Config:
         from_attributes = True
 
+class RSVPCreateResponse(RSVPResponse):
+    """RSVP response for create_rsvp, reporting how many inviters were confirmed."""
+    chain_confirmed_count: int = 0
+
+class RSVPImportRow(BaseModel):
+    """Outcome for one row of a bulk guest import."""
+    row: int  # 1-based position in the upload
+    guest_name: Optional[str] = None
+    guest_phone: Optional[str] = None
+    status: str  # created, exists, duplicate or invalid
+    detail: Optional[str] = None
+    rsvp_id: Optional[int] = None
+
+class RSVPImportResponse(BaseModel):
+    created: int
+    skipped: int
+    rows: List[RSVPImportRow]
+
+class InvitationTreeNode(BaseModel):
+    id: int
+    guest_name: str
+    degree: int
+    is_attending: bool
+    is_confirmed: bool
+    subtree_size: int  # this guest plus everyone downstream of them
+    confirmed_count: int  # confirmed guests in the subtree
+    children: List["InvitationTreeNode"] = []
+
+class InvitationTreeResponse(BaseModel):
+    party_id: int
+    size: int
+    confirmed_count: int
+    children: List[InvitationTreeNode]  # 1st degree guests, invited by the host
+
 class RSVPInviteRequest(BaseModel):
     guest_name: str = Field(..., min_length=1, max_length=100)
     guest_phone: str = Field(..., min_length=10, max_length=10)
@@ -80,14 +119,23 @@ class RSVPInviteResponse(BaseModel):
     invitation_url: str
     message: str
 
+class DownstreamAcceptance(BaseModel):
+    """First person who accepted an RSVP's invitation."""
+    name: str
+    phone: str
+
 class GuestRSVPResponse(RSVPResponse):
     """RSVP response with party info and first downstream acceptance for guest dashboard."""
-    party: PartyResponse
-    first_downstream_acceptance: Optional[dict] = None  # {name: str, phone: str} of first person who accepted their invite
+    party: Optional[PartyResponse]
+    first_downstream_acceptance: Optional[DownstreamAcceptance] = None
     
     class Config:
         from_attributes = True
 
+class PartyRSVPResponse(RSVPResponse):
+    """RSVP response with the name of whoever invited the guest, for the host's party view."""
+    referrer_name: str
+
 # Token schemas
 class Token(BaseModel):
     access_token: str
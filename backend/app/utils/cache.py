@@ -0,0 +1,154 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+def _in_event_loop() -> bool:
+    """True when called on a thread that is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire ttl seconds after being stored.
+
+    get_or_load() collapses concurrent misses for the same key into one call of
+    the loader (single-flight): other threads wait for that load and reuse its
+    result. Code running on an event loop thread (async database mode) never
+    blocks waiting and loads on its own instead. None results are not cached.
+    The cache is per process, so other workers only see an invalidation once
+    their own entry expires.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._inflight = {}  # key -> threading.Event set when the load finishes
+        self._generation = 0  # bumped on invalidation so in-flight loads are not stored
+        self._lock = threading.Lock()
+
+    def _lookup(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            value = self._lookup(key)
+            if value is _MISSING:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value; ttl can shorten (never extend) the cache's default lifetime."""
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """Return the cached value for key, calling loader() at most once per miss."""
+        with self._lock:
+            value = self._lookup(key)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            self.misses += 1
+            event = self._inflight.get(key)
+            leader = event is None
+            if leader:
+                event = self._inflight[key] = threading.Event()
+            generation = self._generation
+        
+        if not leader and not _in_event_loop():
+            event.wait(timeout=self.ttl)
+            with self._lock:
+                value = self._lookup(key)
+                if value is not _MISSING:
+                    self.coalesced += 1
+                    return value
+            # The leading load failed or found nothing; fall back to loading here
+            return loader()
+        
+        if not leader:
+            return loader()
+        
+        value = None
+        try:
+            value = loader()
+            return value
+        finally:
+            with self._lock:
+                if value is not None and generation == self._generation:
+                    self._store(key, value)
+                self._inflight.pop(key, None)
+            event.set()
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generation += 1
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]):
+        """Drop every entry whose value matches predicate."""
+        with self._lock:
+            for key in [key for key, (_, value) in self._entries.items() if predicate(value)]:
+                del self._entries[key]
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced
+            }
+
+# invite_code -> PartyResponse snapshot, for the public RSVP endpoints
+party_cache = TTLCache(
+    maxsize=int(os.getenv("PARTY_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("PARTY_CACHE_TTL", "30"))
+)
+
+# access token -> HostIdentity, for host-authenticated requests
+host_cache = TTLCache(
+    maxsize=int(os.getenv("HOST_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("HOST_CACHE_TTL", "60"))
+)
+
+# (party id, party version) -> serialized invitation tree
+tree_cache = TTLCache(
+    maxsize=int(os.getenv("TREE_CACHE_SIZE", "256")),
+    ttl=float(os.getenv("TREE_CACHE_TTL", "300"))
+)
@@ -0,0 +1,72 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, except_, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.rsvp import RSVP
+from app.models.rsvp_closure import RSVPClosure
+
+CLOSURE_COLUMNS = ["ancestor_id", "descendant_id", "depth"]
+
+def add_closure_rows(rsvp_id: int, invited_by_rsvp_id: Optional[int], db: Session):
+    """Record a new RSVP's ancestry: its inviter's ancestors one hop further away, plus itself.
+
+    Must run in the transaction that inserts the RSVP, after the inviter's own
+    rows exist; nothing is committed here.
+    """
+    rows = select(literal(rsvp_id), literal(rsvp_id), literal(0))
+    if invited_by_rsvp_id is not None:
+        rows = union_all(
+            select(RSVPClosure.ancestor_id, literal(rsvp_id), RSVPClosure.depth + 1).where(
+                RSVPClosure.descendant_id == invited_by_rsvp_id
+            ),
+            rows
+        )
+    db.execute(insert(RSVPClosure).from_select(CLOSURE_COLUMNS, rows))
+
+def add_root_closure_rows(rsvp_ids: Iterable[int], db: Session):
+    """Record the ancestry of new 1st degree RSVPs (just themselves) in one executemany."""
+    rows = [{"ancestor_id": rsvp_id, "descendant_id": rsvp_id, "depth": 0} for rsvp_id in rsvp_ids]
+    if rows:
+        db.execute(insert(RSVPClosure), rows)
+
+def count_subtree(rsvp_id: int, db: Session) -> int:
+    """Number of RSVPs downstream of rsvp_id, including itself."""
+    return db.scalar(
+        select(func.count()).select_from(RSVPClosure).where(RSVPClosure.ancestor_id == rsvp_id)
+    )
+
+def derived_closure():
+    """SELECT of the closure rows implied by invited_by_rsvp_id, walked with a recursive CTE."""
+    ancestry = select(
+        RSVP.id.label("ancestor_id"),
+        RSVP.id.label("descendant_id"),
+        literal(0).label("depth")
+    ).cte("ancestry", recursive=True)
+    ancestry = ancestry.union_all(
+        select(RSVP.invited_by_rsvp_id, ancestry.c.descendant_id, ancestry.c.depth + 1)
+        .join(ancestry, RSVP.id == ancestry.c.ancestor_id)
+        .where(RSVP.invited_by_rsvp_id.isnot(None))
+    )
+    return select(ancestry.c.ancestor_id, ancestry.c.descendant_id, ancestry.c.depth)
+
+def verify_closure(db: Session) -> dict:
+    """Compare rsvp_closure with the ancestry derived from invited_by_rsvp_id.
+
+    Returns the number of rows missing from the table and of extra rows it
+    holds; both are 0 when it is consistent.
+    """
+    actual = select(RSVPClosure.ancestor_id, RSVPClosure.descendant_id, RSVPClosure.depth)
+    count = lambda rows: db.scalar(select(func.count()).select_from(rows.subquery()))
+    return {
+        "missing": count(except_(derived_closure(), actual)),
+        "extra": count(except_(actual, derived_closure()))
+    }
+
+def rebuild_closure(db: Session):
+    """Replace the contents of rsvp_closure with the ancestry derived from invited_by_rsvp_id.
+
+    Nothing is committed here; the caller owns the transaction.
+    """
+    db.execute(delete(RSVPClosure))
+    db.execute(insert(RSVPClosure).from_select(CLOSURE_COLUMNS, derived_closure()))
@@ -0,0 +1,22 @@
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Invite codes come from a large random space, so a conflict is rare; a few
+# attempts make a persistent failure practically impossible.
+MAX_CODE_ATTEMPTS = 5
+
+class CodeAllocationError(RuntimeError):
+    """Raised when no unique code could be allocated."""
+
+def allocate_unique_code(insert: Callable[[str], Optional[T]], generate_code: Callable[[], str], attempts: int = MAX_CODE_ATTEMPTS) -> T:
+    """Insert a row with a freshly generated code, retrying with a new code on conflict.
+
+    insert(code) must write the row and return None when the code collided with
+    an existing one (the unique constraint decides; nothing is probed first).
+    """
+    for _ in range(attempts):
+        result = insert(generate_code())
+        if result is not None:
+            return result
+    raise CodeAllocationError(f"Could not allocate a unique code after {attempts} attempts")
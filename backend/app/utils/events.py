@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import os
+import queue
+import select
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Set
+
+from sqlalchemy.engine import make_url
+
+from app.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+# local delivers within one worker only; postgres fans out across workers with
+# LISTEN/NOTIFY and needs a direct (not transaction-pooled) connection
+EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "local").lower()
+EVENTS_DATABASE_URL = os.getenv("EVENTS_DATABASE_URL", DATABASE_URL)
+# Events buffered per subscriber before it is considered too slow and cut off
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+PG_NOTIFY_CHANNEL = "rsvp_events"
+
+def party_channel(party_id: int) -> str:
+    return f"party:{party_id}"
+
+class EventBackend(ABC):
+    """Carries published messages to the broker of every worker.
+
+    start() receives the broker's deliver(channel, message) callback, which the
+    backend must call for every message published by any worker, this one
+    included. publish() must not block on I/O: it is called from request handlers.
+    """
+
+    def start(self, deliver: Callable[[str, str], None]):
+        self.deliver = deliver
+
+    @abstractmethod
+    def publish(self, channel: str, message: str):
+        """Send message to every worker's subscribers of channel, this worker included."""
+
+class LocalEventBackend(EventBackend):
+    """Delivers within this process only; for a single worker, development and tests."""
+
+    def publish(self, channel: str, message: str):
+        self.deliver(channel, message)
+
+class PostgresEventBackend(EventBackend):
+    """Fans messages out across workers through PostgreSQL LISTEN/NOTIFY.
+
+    Each worker keeps two dedicated psycopg2 connections driven by background
+    threads: one LISTENs and delivers, the other drains an outbox and NOTIFYs.
+    Messages published while the sender is reconnecting are dropped; clients
+    refetch when their stream reconnects.
+    """
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._outbox = queue.Queue()
+
+    def start(self, deliver: Callable[[str, str], None]):
+        super().start(deliver)
+        for target in (self._listen, self._send):
+            threading.Thread(target=target, name=f"events-{target.__name__.strip('_')}", daemon=True).start()
+
+    def publish(self, channel: str, message: str):
+        self._outbox.put(json.dumps([channel, message]))
+
+    def _connect(self):
+        import psycopg2
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def _listen(self):
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {PG_NOTIFY_CHANNEL}")
+                while True:
+                    if select.select([conn], [], [], 5) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        channel, message = json.loads(conn.notifies.pop(0).payload)
+                        self.deliver(channel, message)
+            except Exception:
+                logger.exception("Event listener connection failed; reconnecting")
+                time.sleep(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def _send(self):
+        while True:
+            conn = None
+            try:
+                conn = self._connect()
+                while True:
+                    payload = self._outbox.get()
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT pg_notify(%s, %s)", (PG_NOTIFY_CHANNEL, payload))
+            except Exception:
+                logger.exception("Event sender connection failed; reconnecting")
+                time.sleep(1)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+def _fan_out(queues, message: str):
+    for subscriber in queues:
+        try:
+            subscriber.put_nowait(message)
+        except asyncio.QueueFull:
+            # A subscriber that can't keep up is cut off with None; the client
+            # reconnects and refetches instead of silently missing events
+            while not subscriber.empty():
+                subscriber.get_nowait()
+            subscriber.put_nowait(None)
+
+class EventBroker:
+    """In-process pub/sub of JSON events to asyncio subscribers, fed by an EventBackend.
+
+    publish() is thread-safe and non-blocking, so it can be called from sync
+    endpoints in the threadpool or inside AsyncSession.run_sync. Each message is
+    serialized once and handed to every event loop with subscribers in a single
+    call_soon_threadsafe, which then fills that loop's subscriber queues.
+    """
+
+    def __init__(self, backend: EventBackend, queue_size: int = EVENT_QUEUE_SIZE):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._started = False
+        self._channels: Dict[str, Dict[asyncio.AbstractEventLoop, Set[asyncio.Queue]]] = {}
+
+    def _ensure_started(self):
+        # Started on first use so forked workers each start their own backend
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.backend.start(self._deliver)
+
+    def publish(self, channel: str, event: dict):
+        self._ensure_started()
+        self.backend.publish(channel, json.dumps(event, separators=(",", ":")))
+
+    def _deliver(self, channel: str, message: str):
+        with self._lock:
+            loops = self._channels.get(channel)
+            targets = [(loop, tuple(queues)) for loop, queues in loops.items()] if loops else []
+        for loop, queues in targets:
+            try:
+                loop.call_soon_threadsafe(_fan_out, queues, message)
+            except RuntimeError:
+                pass  # The loop closed; its subscribers are gone
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        """Yield an asyncio.Queue of serialized events for channel; None means the subscriber was cut off."""
+        self._ensure_started()
+        loop = asyncio.get_running_loop()
+        subscriber = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._channels.setdefault(channel, {}).setdefault(loop, set()).add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            with self._lock:
+                loops = self._channels[channel]
+                loops[loop].discard(subscriber)
+                if not loops[loop]:
+                    del loops[loop]
+                if not loops:
+                    del self._channels[channel]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "channels": len(self._channels),
+                "subscribers": sum(len(queues) for loops in self._channels.values() for queues in loops.values())
+            }
+
+def _create_backend() -> EventBackend:
+    if EVENTS_BACKEND == "postgres":
+        # psycopg2 takes a libpq URL without SQLAlchemy's driver suffix
+        dsn = make_url(EVENTS_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresEventBackend(dsn)
+    return LocalEventBackend()
+
+event_broker = EventBroker(_create_backend())
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from typing import List, Optional, Tuple
+
+from app.utils.helpers import format_phone_number
+
+# Largest guest list accepted in one upload
+MAX_IMPORT_ROWS = 100_000
+
+_TRUE_VALUES = {"true", "yes", "y", "1"}
+_FALSE_VALUES = {"false", "no", "n", "0"}
+
+class GuestImportError(ValueError):
+    """Raised when an uploaded guest list cannot be read at all."""
+
+def parse_guest_upload(content: bytes, filename: Optional[str], content_type: Optional[str]) -> List[dict]:
+    """Parse a CSV (with a header row) or JSON array guest list into raw records."""
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise GuestImportError("Upload must be UTF-8 encoded")
+    
+    is_json = (content_type or "").endswith("json") or (filename or "").lower().endswith(".json")
+    if is_json:
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise GuestImportError(f"Invalid JSON: {e}")
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            raise GuestImportError("JSON upload must be an array of guest objects")
+    else:
+        records = list(csv.DictReader(io.StringIO(text)))
+    
+    if len(records) > MAX_IMPORT_ROWS:
+        raise GuestImportError(f"Upload has {len(records)} rows; the limit is {MAX_IMPORT_ROWS}")
+    return records
+
+def _parse_attending(value) -> Optional[bool]:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in _TRUE_VALUES:
+        return True
+    if value in _FALSE_VALUES:
+        return False
+    return None
+
+def normalize_guest(record: dict) -> Tuple[Optional[dict], Optional[str]]:
+    """Validate one record; returns (guest, None) or (None, reason it was rejected).
+
+    Accepts guest_name/name, guest_phone/phone and is_attending/attending
+    columns (case-insensitive); attendance defaults to yes.
+    """
+    fields = {str(key).strip().lower(): value for key, value in record.items() if key is not None}
+    name = str(fields.get("guest_name") or fields.get("name") or "").strip()
+    phone = format_phone_number(str(fields.get("guest_phone") or fields.get("phone") or ""))
+    is_attending = _parse_attending(fields.get("is_attending", fields.get("attending")))
+    
+    if not name or len(name) > 100:
+        return None, "Guest name must be 1-100 characters"
+    if len(phone) != 10:
+        return None, "Phone number must be 10 digits"
+    if is_attending is None:
+        return None, "is_attending must be yes/no or true/false"
+    return {"guest_name": name, "guest_phone": phone, "is_attending": is_attending}, None
@@ -0,0 +1,93 @@
+import hmac
+import os
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Response, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+
+# Request metrics at /metrics. Under gunicorn, gunicorn.conf.py sets
+# PROMETHEUS_MULTIPROC_DIR so every worker's samples are aggregated.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+# Bearer token for /metrics and the /health/* stats; unset, those endpoints are not served
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+metrics_auth = HTTPBearer(auto_error=False)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ["method", "route", "status"]
+)
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Time to send the response headers", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+# Labelled by method only: the route isn't known until routing has run
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ["method"], multiprocess_mode="livesum"
+)
+
+def route_label(scope) -> str:
+    """The matched route's path template, so ids, invite codes and phones never become labels."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, in-flight requests and latency per route template.
+
+    Latency is measured to the response start, so long-lived streams (event
+    streams, exports) are not skewed by how long the client keeps reading.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        method = scope["method"]
+        start = time.perf_counter()
+        duration = None
+        status = 500  # Unless a response starts before an exception escapes
+        
+        async def send_with_metrics(message):
+            nonlocal duration, status
+            if message["type"] == "http.response.start":
+                duration = time.perf_counter() - start
+                status = message["status"]
+            await send(message)
+        
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            in_progress.dec()
+            route = route_label(scope)
+            if duration is None:
+                duration = time.perf_counter() - start
+            REQUEST_DURATION.labels(method, route).observe(duration)
+            REQUESTS.labels(method, route, str(status)).inc()
+
+def metrics_response() -> Response:
+    """All metrics in Prometheus text format, across workers in multiprocess mode."""
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+def require_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_auth)):
+    """Guard for the operational endpoints: pool, cache and event stats say too much to serve publicly."""
+    if METRICS_TOKEN is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(credentials.credentials.encode(), METRICS_TOKEN.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
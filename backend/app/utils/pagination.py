@@ -0,0 +1,65 @@
+import base64
+import binascii
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Query, aliased
+
+from app.models.rsvp import RSVP
+
+# Largest page a client may request from the RSVP list endpoints
+MAX_PAGE_SIZE = 1000
+
+def encode_cursor(rsvp_id: int) -> str:
+    """Opaque cursor pointing just after the given RSVP."""
+    return base64.urlsafe_b64encode(str(rsvp_id).encode()).decode()
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    if not cursor:
+        return None
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+def filter_rsvps(query: Query, is_attending: Optional[bool] = None, degree: Optional[int] = None, is_confirmed: Optional[bool] = None) -> Query:
+    """Apply the optional RSVP list filters."""
+    if is_attending is not None:
+        query = query.filter(RSVP.is_attending == is_attending)
+    if degree is not None:
+        query = query.filter(RSVP.degree == degree)
+    if is_confirmed is not None:
+        query = query.filter(RSVP.is_confirmed == is_confirmed)
+    return query
+
+def paginate_rsvps(query: Query, cursor: Optional[str], limit: Optional[int]) -> Tuple[List, Optional[str]]:
+    """Return one page of query in (created_at, id) order and the cursor for the next page.
+
+    The cursor only carries the last RSVP id; its created_at is read back inside
+    the query so the comparison uses the stored value exactly. Without a limit
+    every remaining row is returned and there is no next cursor.
+    """
+    query = query.order_by(RSVP.created_at, RSVP.id)
+    
+    after_id = decode_cursor(cursor)
+    if after_id is not None:
+        CursorRSVP = aliased(RSVP)
+        after_created_at = select(CursorRSVP.created_at).where(CursorRSVP.id == after_id).scalar_subquery()
+        query = query.filter(or_(
+            RSVP.created_at > after_created_at,
+            and_(RSVP.created_at == after_created_at, RSVP.id > after_id)
+        ))
+    
+    if limit is None:
+        return query.all(), None
+    
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].id)
@@ -0,0 +1,120 @@
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Per-request query counting (X-DB-Queries and Server-Timing headers). Off by
+# default: when disabled no engine hooks or middleware are installed at all.
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS", "false").lower() in ("1", "true", "yes")
+# Statements slower than this are logged with the request that ran them
+QUERY_STATS_SLOW_MS = float(os.getenv("QUERY_STATS_SLOW_MS", "100"))
+
+class QueryStats:
+    """Statements executed while tracking was active, and the time spent in them."""
+
+    def __init__(self, parent: Optional["QueryStats"] = None):
+        self.parent = parent
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, elapsed: float):
+        # Nested trackers (a test budget around a request) each see the statement
+        stats = self
+        while stats is not None:
+            stats.count += 1
+            stats.total_time += elapsed
+            if elapsed > stats.slowest_time:
+                stats.slowest_time = elapsed
+                stats.slowest_statement = statement
+            stats = stats.parent
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_hooks_lock = threading.Lock()
+_hooks_installed = False
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Context variables follow requests into the threadpool and AsyncSession.run_sync
+    start = conn.info.pop("query_start", None)
+    stats = _current_stats.get()
+    if stats is not None and start is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+def install_query_hooks():
+    """Listen for statements on every engine, current and future. Idempotent."""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _hooks_installed = True
+
+@contextmanager
+def track_queries():
+    """Count the statements run in this context (including threads it hands work to)."""
+    install_query_hooks()
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+@contextmanager
+def assert_query_budget(max_queries: int):
+    """Fail with AssertionError if the code inside runs more than max_queries statements.
+
+        with assert_query_budget(2):
+            client.get(f"/api/rsvp/party/{invite_code}/rsvps")
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise AssertionError(
+            f"Ran {stats.count} queries, budget is {max_queries}; slowest: {stats.slowest_statement}"
+        )
+
+class QueryStatsMiddleware:
+    """ASGI middleware adding X-DB-Queries and a Server-Timing db entry to every response.
+
+    Statements a streaming response runs after its headers are sent are not included.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        install_query_hooks()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        with track_queries() as stats:
+            async def send_with_stats(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-db-queries", str(stats.count).encode()),
+                        (b"server-timing", f'db;dur={stats.total_time * 1000:.3f};desc="{stats.count} queries"'.encode())
+                    ]
+                    if stats.slowest_time * 1000 >= QUERY_STATS_SLOW_MS:
+                        logger.info(
+                            "%s %s: slowest of %d queries took %.1f ms: %s",
+                            scope["method"], scope["path"], stats.count,
+                            stats.slowest_time * 1000, stats.slowest_statement
+                        )
+                await send(message)
+            
+            await self.app(scope, receive, send_with_stats)
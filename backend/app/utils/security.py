@@ -1,11 +1,27 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta
+import asyncio
+import multiprocessing
 import os
-from typing import Optional
+import threading
+from typing import Optional, Tuple
 
-# Password hashing - using pbkdf2_sha256 as fallback for bcrypt issues
-pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
+# Password hashing - using pbkdf2_sha256 as fallback for bcrypt issues.
+# Hashes below PASSWORD_HASH_ROUNDS are re-hashed on the next successful login.
+PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", "29000"))
+pwd_context = CryptContext(
+    schemes=["pbkdf2_sha256", "bcrypt"],
+    deprecated="auto",
+    pbkdf2_sha256__default_rounds=PASSWORD_HASH_ROUNDS,
+    pbkdf2_sha256__min_rounds=PASSWORD_HASH_ROUNDS
+)
+
+# Hashing runs in a small process pool so it never occupies a request worker;
+# once HASH_POOL_MAX_PENDING jobs are queued further requests are refused.
+HASH_POOL_WORKERS = int(os.getenv("HASH_POOL_WORKERS", "2"))
+HASH_POOL_MAX_PENDING = int(os.getenv("HASH_POOL_MAX_PENDING", "16"))
 
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
@@ -20,6 +36,56 @@ def get_password_hash(password: str) -> str:
     """Hash a password."""
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses outdated parameters."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+class HashingBusyError(Exception):
+    """Raised when the password hashing pool has no room for another job."""
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+_hash_pool_slots = threading.BoundedSemaphore(HASH_POOL_WORKERS + HASH_POOL_MAX_PENDING)
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # spawn, not fork: request workers are multi-threaded
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=HASH_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _hash_pool
+
+def _submit_hash_job(fn, *args) -> Future:
+    if not _hash_pool_slots.acquire(blocking=False):
+        raise HashingBusyError()
+    try:
+        future = _get_hash_pool().submit(fn, *args)
+    except BaseException:
+        _hash_pool_slots.release()
+        raise
+    future.add_done_callback(lambda _: _hash_pool_slots.release())
+    return future
+
+def hashing_available() -> bool:
+    """Whether the hashing pool has room for another job right now (a hint; submitting can still fail)."""
+    if not _hash_pool_slots.acquire(blocking=False):
+        return False
+    _hash_pool_slots.release()
+    return True
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the hashing pool. Raises HashingBusyError when the pool is saturated."""
+    return await asyncio.wrap_future(_submit_hash_job(get_password_hash, password))
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password in the hashing pool. Raises HashingBusyError when the pool is saturated."""
+    return await asyncio.wrap_future(
+        _submit_hash_job(verify_and_update_password, plain_password, hashed_password)
+    )
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -32,13 +98,19 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[str]:
-    """Verify a JWT token and return the phone number if valid."""
+def decode_token(token: str) -> Optional[dict]:
+    """Verify a JWT token and return its claims if valid."""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        phone: str = payload.get("sub")
-        if phone is None:
-            return None
-        return phone
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def verify_token(token: str) -> Optional[str]:
+    """Verify a JWT token and return the phone number if valid."""
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    return payload["sub"]
@@ -0,0 +1,43 @@
+from typing import Iterable, List
+
+def build_invitation_tree(rows: Iterable) -> List[dict]:
+    """Nest a party's RSVPs under their inviters and return the 1st-degree roots.
+
+    rows need id, invited_by_rsvp_id, guest_name, degree, is_attending and
+    is_confirmed. Runs in O(n) without recursion: one pass links children,
+    then subtree sizes are summed in reverse depth-first order. An RSVP whose
+    inviter isn't among rows is treated as a root.
+    """
+    nodes = {}
+    for row in rows:
+        nodes[row.id] = {
+            "id": row.id,
+            "guest_name": row.guest_name,
+            "degree": row.degree,
+            "is_attending": row.is_attending,
+            "is_confirmed": row.is_confirmed,
+            "subtree_size": 1,
+            "confirmed_count": 1 if row.is_confirmed else 0,
+            "invited_by_rsvp_id": row.invited_by_rsvp_id,
+            "children": []
+        }
+    
+    roots = []
+    for node in nodes.values():
+        parent = nodes.get(node.pop("invited_by_rsvp_id"))
+        (parent["children"] if parent is not None else roots).append(node)
+    
+    # Parents come before their children in a depth-first order, so walking it
+    # backwards finishes every subtree before its parent is reached
+    order = []
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(node["children"])
+    for node in reversed(order):
+        for child in node["children"]:
+            node["subtree_size"] += child["subtree_size"]
+            node["confirmed_count"] += child["confirmed_count"]
+    
+    return roots
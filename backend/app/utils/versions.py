@@ -0,0 +1,57 @@
+from typing import Optional
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.party import Party
+from app.schemas import PartyResponse
+
+def bump_party_version(party_id: int, db: Session) -> bool:
+    """Increment the party's version so cached copies of its pages revalidate.
+
+    Call it last before committing a write to the party or its RSVPs: the
+    UPDATE holds the party row's lock until commit. Returns False if the
+    party no longer exists, so writes working from a cached party can roll
+    back instead of leaving orphaned rows.
+    """
+    result = db.execute(
+        update(Party)
+        .where(Party.id == party_id)
+        .values(version=Party.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+def party_etag(party_id: int, version: int) -> str:
+    return f'"party-{party_id}-v{version}"'
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """If-None-Match comparison (weak, as RFC 9110 specifies for it)."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+def check_party_etag(invite_code: str, if_none_match: Optional[str], response: Response, db: Session) -> PartyResponse:
+    """Answer a conditional GET for a party page from its version alone.
+
+    One indexed lookup of the party row by invite code: raises 304 Not Modified
+    when If-None-Match matches, otherwise sets the ETag on response and returns
+    the party, so the page needs no second lookup. Raises 404 if the party
+    doesn't exist. Deliberately not served from the party cache: the version
+    must be current in every worker.
+    """
+    party = db.query(Party).filter(Party.invite_code == invite_code).first()
+    if not party:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Party not found"
+        )
+    
+    etag = party_etag(party.id, party.version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(etag, if_none_match):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return PartyResponse.model_validate(party)
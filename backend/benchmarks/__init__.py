@@ -0,0 +1,10 @@
+"""Benchmarks for the API, driven in-process against a seeded database.
+
+    cd backend
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.compare before.json results.json
+
+See benchmarks.run --help for the data shape and load options. Run with
+PARTY_CACHE_SIZE=0 to measure the endpoints without the party cache.
+"""
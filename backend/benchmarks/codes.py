@@ -0,0 +1,113 @@
+"""Time invitation code allocation against a table holding millions of codes.
+
+Bulk-seeds --existing RSVPs with invitation codes into one party, then creates
+--allocations RSVPs the way create_rsvp does: allocate_unique_code around
+upsert_rsvp, one transaction each. With --collision-rate, that share of the
+generated codes are taken from the seeded ones, to time the retry path.
+
+    python -m benchmarks.codes [--existing 1000000] [--allocations 2000]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.run import percentile, use_database
+
+SEED_BATCH_SIZE = 10_000
+
+def seed_codes(engine, existing: int) -> tuple:
+    """Insert a host, a party and existing RSVPs with invitation codes; returns (party_id, sample of the codes)."""
+    from sqlalchemy import insert
+    from app.models import Host, Party, RSVP
+    from app.utils.helpers import generate_invite_code, generate_rsvp_invitation_code
+    
+    sample = []
+    with engine.begin() as conn:
+        host_id = conn.execute(insert(Host).values(
+            phone=f"{random.randrange(10**9, 10**10)}", password_hash="!", name="Codes Host"
+        ).returning(Host.id)).scalar_one()
+        party_id = conn.execute(insert(Party).values(
+            name="Codes Party", start_time=datetime.now(timezone.utc) + timedelta(days=7),
+            location="Somewhere", invite_code=generate_invite_code(), host_id=host_id
+        ).returning(Party.id)).scalar_one()
+        
+        for start in range(0, existing, SEED_BATCH_SIZE):
+            rows = [
+                {
+                    "party_id": party_id, "guest_name": "Seeded Guest", "guest_phone": f"{number:010d}",
+                    "is_attending": True, "degree": 1, "invitation_code": generate_rsvp_invitation_code(),
+                    "is_confirmed": False, "has_sent_invitation": False
+                }
+                for number in range(start, min(start + SEED_BATCH_SIZE, existing))
+            ]
+            conn.execute(insert(RSVP), rows)
+            sample.extend(row["invitation_code"] for row in rows[:10])
+    return party_id, sample
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to seed (default: DATABASE_URL or a new SQLite file)")
+    parser.add_argument("--existing", type=int, default=1_000_000, help="invitation codes already in the table")
+    parser.add_argument("--allocations", type=int, default=2000, help="RSVPs to create, one allocation each")
+    parser.add_argument("--collision-rate", type=float, default=0.0, help="share of generated codes that already exist")
+    args = parser.parse_args()
+    use_database(args.database_url)
+    
+    from sqlalchemy import func, select
+    from app.database import Base, get_engine, get_session_local
+    from app.models import RSVP
+    from app.routes.rsvp import upsert_rsvp
+    from app.utils.codes import CodeAllocationError, allocate_unique_code
+    from app.utils.helpers import generate_rsvp_invitation_code
+    from app.utils.query_stats import track_queries
+    
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    print(f"Seeding {args.existing:,} invitation codes...")
+    start = time.perf_counter()
+    party_id, taken_codes = seed_codes(engine, args.existing)
+    with engine.connect() as conn:
+        total = conn.scalar(select(func.count()).where(RSVP.invitation_code.isnot(None)))
+    print(f"Seeded in {time.perf_counter() - start:.1f}s; {total:,} codes in the table\n")
+    
+    def generate_code():
+        if random.random() < args.collision_rate:
+            return random.choice(taken_codes)
+        return generate_rsvp_invitation_code()
+    
+    SessionLocal = get_session_local()
+    latencies = []
+    attempts = 0
+    failures = 0
+    with track_queries() as queries:
+        for number in range(args.allocations):
+            values = {
+                "party_id": party_id, "guest_name": "New Guest", "guest_phone": f"{9_000_000_000 + number:010d}",
+                "is_attending": True, "degree": 1, "invited_by_rsvp_id": None,
+                "is_confirmed": False, "has_sent_invitation": False
+            }
+            
+            def insert(code):
+                nonlocal attempts
+                attempts += 1
+                return upsert_rsvp({**values, "invitation_code": code}, db)
+            
+            start = time.perf_counter()
+            with SessionLocal() as db:
+                try:
+                    allocate_unique_code(insert, generate_code)
+                    db.commit()
+                except CodeAllocationError:
+                    failures += 1
+            latencies.append(time.perf_counter() - start)
+    
+    latencies.sort()
+    print(f"{args.allocations:,} allocations against {total:,} existing codes (collision rate {args.collision_rate:.0%}):")
+    print(f"    p50 {percentile(latencies, 0.50) * 1000:.3f} ms  p99 {percentile(latencies, 0.99) * 1000:.3f} ms")
+    print(f"    {attempts / args.allocations:.3f} attempts and {queries.count / args.allocations:.2f} statements per allocation")
+    if failures:
+        print(f"    {failures} allocations gave up after every attempt collided")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Compare two benchmarks.run JSON reports, endpoint by endpoint.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import json
+import sys
+
+METRICS = ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "db_p50_ms", "queries_per_request")
+
+def change(before: float, after: float) -> str:
+    if not before:
+        return "   n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+def main():
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(2)
+    with open(sys.argv[1]) as f:
+        before = json.load(f)
+    with open(sys.argv[2]) as f:
+        after = json.load(f)
+    
+    print(f"{before['meta']['commit']} -> {after['meta']['commit']}\n")
+    for name, result in after["results"].items():
+        baseline = before["results"].get(name)
+        print(name)
+        for metric in METRICS:
+            if metric not in result:
+                continue
+            if baseline is None or metric not in baseline:
+                print(f"    {metric:<20} {result[metric]:>10}")
+            else:
+                print(f"    {metric:<20} {baseline[metric]:>10} -> {result[metric]:>10}  {change(baseline[metric], result[metric])}")
+
+if __name__ == "__main__":
+    main()
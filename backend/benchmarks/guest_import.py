@@ -0,0 +1,82 @@
+"""Time a guest-list import of tens of thousands of rows.
+
+Uploads one CSV of --rows guests to POST /api/parties/{party_id}/rsvps/import
+twice: first every row is a new guest, then the same file again, when every row
+is skipped as an existing one. Reports wall time, rows per second and SQL
+statements for each import, and the latency of GET /api/rsvp/party/{invite_code}
+requests sent while it runs.
+
+    python -m benchmarks.guest_import [--rows 50000]
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+from benchmarks.run import percentile, use_database
+from benchmarks.shapes import SeedShape
+
+def build_guest_csv(rows: int) -> str:
+    lines = ["guest_name,guest_phone,is_attending"]
+    lines.extend(f"Imported Guest {n},{8_000_000_000 + n:010d},{'yes' if n % 4 else 'no'}" for n in range(rows))
+    return "\n".join(lines) + "\n"
+
+async def probe(client, url: str, stop: asyncio.Event) -> List[float]:
+    """GET url back to back until stop is set; returns the sorted latencies."""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        (await client.get(url)).raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.01)
+    return sorted(latencies)
+
+async def run(args, seeded):
+    import httpx
+    from app.main import app
+    from app.utils.query_stats import track_queries
+    
+    auth = {"Authorization": f"Bearer {seeded.host_token}"}
+    url = f"/api/parties/{seeded.large_party_id}/rsvps/import"
+    probe_url = f"/api/rsvp/party/{seeded.large_party_code}"
+    upload = build_guest_csv(args.rows)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=600) as client:
+        await client.get(probe_url)  # Warm up the connection pool
+        
+        print(f"Importing {args.rows:,} guests ({len(upload) / 2**20:.1f} MB of CSV):")
+        for label in ("new guests", "same file again"):
+            # Started before tracking so only the import's statements are counted
+            stop = asyncio.Event()
+            probing = asyncio.create_task(probe(client, probe_url, stop))
+            with track_queries() as queries:
+                start = time.perf_counter()
+                response = await client.post(url, headers=auth, files={"file": ("guests.csv", upload, "text/csv")})
+                elapsed = time.perf_counter() - start
+            stop.set()
+            latencies = await probing
+            response.raise_for_status()
+            report = response.json()
+            
+            print(
+                f"    {label:<16} {elapsed:7.2f} s  {args.rows / elapsed:8.0f} rows/s  "
+                f"{queries.count:4d} statements  created {report['created']:,}, skipped {report['skipped']:,}"
+            )
+            print(
+                f"    {'':<16} {len(latencies)} party page requests meanwhile: "
+                f"p50 {percentile(latencies, 0.50) * 1000:.2f} ms  max {latencies[-1] * 1000:.2f} ms"
+            )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to seed (default: DATABASE_URL or a new SQLite file)")
+    parser.add_argument("--rows", type=int, default=50_000, help="guests in the uploaded CSV")
+    args = parser.parse_args()
+    use_database(args.database_url)
+    
+    from benchmarks.seed import seed
+    seeded = seed(SeedShape(hosts=1, parties_per_host=1, large_party_rsvps=1000, frequent_guest_parties=1))
+    asyncio.run(run(args, seeded))
+
+if __name__ == "__main__":
+    main()
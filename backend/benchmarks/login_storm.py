@@ -0,0 +1,99 @@
+"""Measure a non-auth endpoint's latency while /api/auth/login is flooded.
+
+Seeds a small data set, then times GET /api/rsvp/party/{invite_code}/rsvps
+twice: alone, and while --storm clients send logins back to back. Reports
+p50/p99 for both runs, and how many logins were turned away with 503 because
+the password hashing pool was full.
+
+    python -m benchmarks.login_storm [--storm 64] [--requests 1000]
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List
+
+from benchmarks.run import percentile, use_database
+from benchmarks.shapes import HOST_PASSWORD, SeedShape
+
+async def time_requests(client, url: str, requests: int, concurrency: int) -> List[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    
+    async def send():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+    
+    await asyncio.gather(*(send() for _ in range(requests)))
+    return sorted(latencies)
+
+async def send_logins(client, body: dict, stop: asyncio.Event, statuses: Counter, latencies: List[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.post("/api/auth/login", json=body)
+        statuses[response.status_code] += 1
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+
+def report(label: str, latencies: List[float]):
+    print(
+        f"{label:<34} p50 {percentile(latencies, 0.50) * 1000:8.2f} ms  "
+        f"p99 {percentile(latencies, 0.99) * 1000:8.2f} ms"
+    )
+
+async def run(args, seeded):
+    import httpx
+    from app.main import app
+    
+    url = f"/api/rsvp/party/{seeded.large_party_code}/rsvps?limit=100"
+    login = {"phone": seeded.host_phone, "password": HOST_PASSWORD}
+    # Count server errors (e.g. pool timeouts) as statuses instead of raising them
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=60) as client:
+        # Warm up the connection pool and start the hashing pool's processes
+        await time_requests(client, url, 20, args.concurrency)
+        (await client.post("/api/auth/login", json=login)).raise_for_status()
+        
+        alone = await time_requests(client, url, args.requests, args.concurrency)
+        
+        stop = asyncio.Event()
+        statuses = Counter()
+        login_latencies = []
+        storm = [
+            asyncio.create_task(send_logins(client, login, stop, statuses, login_latencies))
+            for _ in range(args.storm)
+        ]
+        await asyncio.sleep(0.5)  # Let the hashing pool fill up
+        during = await time_requests(client, url, args.requests, args.concurrency)
+        stop.set()
+        await asyncio.gather(*storm)
+    
+    print(f"GET {url}, {args.concurrency} at a time:")
+    report("    alone", alone)
+    report(f"    during a {args.storm}-client login storm", during)
+    sent = sum(statuses.values())
+    print(f"\n{sent} logins: {statuses[200]} succeeded, {statuses[503]} got 503 ({statuses[503] / sent:.1%})")
+    if login_latencies:
+        report("    successful logins", sorted(login_latencies))
+    other = {status: count for status, count in statuses.items() if status not in (200, 503)}
+    if other:
+        print(f"    unexpected statuses: {other}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to seed (default: DATABASE_URL or a new SQLite file)")
+    parser.add_argument("--storm", type=int, default=64, help="clients sending logins back to back")
+    parser.add_argument("--requests", type=int, default=1000, help="timed non-auth requests per run")
+    parser.add_argument("--concurrency", type=int, default=10, help="timed requests in flight at once")
+    args = parser.parse_args()
+    use_database(args.database_url)
+    
+    from benchmarks.seed import seed
+    seeded = seed(SeedShape(hosts=2, parties_per_host=1, large_party_rsvps=1000, frequent_guest_parties=1))
+    asyncio.run(run(args, seeded))
+
+if __name__ == "__main__":
+    main()
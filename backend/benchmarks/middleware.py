@@ -0,0 +1,55 @@
+"""Measure the per-request cost of the app's ASGI middleware.
+
+Calls each middleware around a no-op ASGI app with a routed scope, directly
+and without an HTTP client, so the difference from the bare app is the
+middleware's own overhead.
+
+    python -m benchmarks.middleware [--requests 100000]
+"""
+import argparse
+import asyncio
+import time
+
+from app.utils.metrics import MetricsMiddleware
+from app.utils.query_stats import QueryStatsMiddleware
+
+class _Route:
+    path = "/api/rsvp/party/{invite_code}"
+
+async def bare_app(scope, receive, send):
+    scope["route"] = _Route()  # As FastAPI's router sets it
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+async def receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+async def send(message):
+    pass
+
+async def time_app(app, requests: int) -> float:
+    """Average seconds per request."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        scope = {"type": "http", "method": "GET", "path": "/api/rsvp/party/abc123", "headers": []}
+        await app(scope, receive, send)
+    return (time.perf_counter() - start) / requests
+
+async def main(requests: int):
+    apps = {
+        "bare app": bare_app,
+        "MetricsMiddleware": MetricsMiddleware(bare_app),
+        "QueryStatsMiddleware": QueryStatsMiddleware(bare_app),
+    }
+    for app in apps.values():
+        await time_app(app, 1000)  # Warm up
+    
+    baseline = await time_app(bare_app, requests)
+    for name, app in apps.items():
+        per_request = await time_app(app, requests)
+        print(f"{name:<22} {per_request * 1e6:8.2f} us/request  (+{(per_request - baseline) * 1e6:.2f} us)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args().requests))
@@ -0,0 +1,300 @@
+"""Seed a database and drive every API endpoint in-process through an ASGI client.
+
+Reports throughput, p50/p95/p99 latency and SQL queries per request for each
+endpoint, and writes them as JSON for comparing commits (benchmarks.compare).
+Exits with status 1 if a request exceeded its endpoint's query budget.
+
+Uses DATABASE_URL when it is set in the environment (PostgreSQL included) or
+passed with --database-url, otherwise a fresh SQLite file. Seeding writes to
+that database, so never point it at one holding real data.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from itertools import count
+from typing import Callable, List, Optional, Union
+
+from benchmarks.shapes import HOST_DASHBOARD_FLOW, HOST_PASSWORD, TREE_SHAPES, SeedShape
+
+@dataclass
+class Scenario:
+    name: str
+    # Request number -> httpx request keyword arguments, or a list of them sent
+    # one after another and measured as one request (a flow)
+    build: Callable[[int], Union[dict, List[dict]]]
+    max_queries: int  # Query budget per request, cache misses included
+    status: int = 200
+
+def build_scenarios(seeded, created_party_ids: List[int]) -> List[Scenario]:
+    auth = {"Authorization": f"Bearer {seeded.host_token}"}
+    party_id = seeded.large_party_id
+    code = seeded.large_party_code
+    phones = count(7_000_000_000)
+    
+    def get(url, **kwargs):
+        return lambda i: {"method": "GET", "url": url, **kwargs}
+    
+    def host_dashboard(token):
+        headers = {"Authorization": f"Bearer {token}"}
+        flow = [{"method": "GET", "url": url.format(party_id=party_id), "headers": headers} for url in HOST_DASHBOARD_FLOW]
+        return lambda i: flow
+    
+    def create_rsvp(invited_by_code=None, invite_code=code):
+        def build(i):
+            body = {"guest_name": f"Bench Guest {i}", "guest_phone": f"{next(phones):010d}", "is_attending": True}
+            if invited_by_code:
+                body["invited_by_code"] = invited_by_code
+            return {"method": "POST", "url": f"/api/rsvp/party/{invite_code}/rsvp", "json": body}
+        return build
+    
+    def import_guests(i):
+        rows = "\n".join(f"Imported Guest {n},{next(phones):010d},yes" for n in range(100))
+        return {
+            "method": "POST", "url": f"/api/parties/{party_id}/rsvps/import", "headers": auth,
+            "files": {"file": ("guests.csv", f"guest_name,guest_phone,is_attending\n{rows}\n", "text/csv")}
+        }
+    
+    def create_party(i):
+        body = {"name": f"Bench Party {i}", "start_time": "2030-01-01T20:00:00Z", "location": "Somewhere"}
+        return {"method": "POST", "url": "/api/parties/", "headers": auth, "json": body}
+    
+    def delete_party(i):
+        return {"method": "DELETE", "url": f"/api/parties/{created_party_ids.pop()}", "headers": auth}
+    
+    # The host view, tree and chain confirmation at each seeded party size
+    sized = []
+    for party in seeded.sized_parties:
+        sized.extend([
+            Scenario(
+                f"GET /api/rsvp/party/{{invite_code}}/rsvps/all ({party.rsvps} RSVPs)",
+                get(f"/api/rsvp/party/{party.invite_code}/rsvps/all"), 2
+            ),
+            Scenario(
+                f"GET /api/parties/{{party_id}}/tree ({party.rsvps} RSVPs)",
+                get(f"/api/parties/{party.party_id}/tree", headers=auth), 3
+            ),
+            Scenario(
+                f"POST /api/rsvp/party/{{invite_code}}/rsvp (3rd degree, {party.rsvps} RSVPs)",
+                create_rsvp(party.inviter_code, party.invite_code), 6
+            ),
+        ])
+    
+    return [
+        Scenario("POST /api/auth/login", lambda i: {
+            "method": "POST", "url": "/api/auth/login",
+            "json": {"phone": seeded.host_phone, "password": HOST_PASSWORD}
+        }, 1),
+        Scenario("GET /api/auth/me", get("/api/auth/me", headers=auth), 2),
+        # The host's 1 query for /me plus one per party request, and a host lookup per
+        # request when a phone-only token misses the host cache
+        Scenario("host dashboard flow", host_dashboard(seeded.host_token), 5),
+        Scenario("host dashboard flow (phone-only token)", host_dashboard(seeded.legacy_host_token), 9),
+        Scenario("GET /api/parties/", get("/api/parties/", headers=auth), 2),
+        Scenario("POST /api/parties/", create_party, 2),
+        Scenario("GET /api/parties/{party_id}", get(f"/api/parties/{party_id}", headers=auth), 2),
+        Scenario("GET /api/parties/{party_id}/rsvps?limit=100", get(f"/api/parties/{party_id}/rsvps?limit=100", headers=auth), 3),
+        Scenario("GET /api/parties/{party_id}/rsvps/export", get(f"/api/parties/{party_id}/rsvps/export", headers=auth), 3),
+        Scenario("GET /api/parties/{party_id}/tree", get(f"/api/parties/{party_id}/tree", headers=auth), 3),
+        Scenario("POST /api/parties/{party_id}/rsvps/import (100 rows)", import_guests, 6),
+        Scenario("DELETE /api/parties/{party_id}", delete_party, 5),
+        Scenario("GET /api/rsvp/party/{invite_code}", get(f"/api/rsvp/party/{code}"), 1),
+        Scenario("POST /api/rsvp/party/{invite_code}/rsvp (1st degree)", create_rsvp(), 4),
+        Scenario("POST /api/rsvp/party/{invite_code}/rsvp (3rd degree)", create_rsvp(seeded.inviter_code), 6),
+        Scenario("GET /api/rsvp/rsvp/{rsvp_id}", get(f"/api/rsvp/rsvp/{seeded.rsvp_id}"), 2),
+        Scenario("GET /api/rsvp/guest/{phone}/rsvps", get(f"/api/rsvp/guest/{seeded.frequent_guest_phone}/rsvps"), 2),
+        Scenario("GET /api/rsvp/guest/{phone}/party/{invite_code}", get(f"/api/rsvp/guest/{seeded.guest_phone}/party/{code}"), 3),
+        Scenario("GET /api/rsvp/party/{invite_code}/rsvps/all", get(f"/api/rsvp/party/{code}/rsvps/all"), 2),
+        Scenario("GET /api/rsvp/party/{invite_code}/rsvps/all?limit=100", get(f"/api/rsvp/party/{code}/rsvps/all?limit=100"), 2),
+        Scenario("GET /api/rsvp/party/{invite_code}/rsvps", get(f"/api/rsvp/party/{code}/rsvps"), 3),
+        Scenario("GET /api/rsvp/party/{invite_code}/rsvps?limit=100", get(f"/api/rsvp/party/{code}/rsvps?limit=100"), 3),
+        *sized
+    ]
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, round(fraction * (len(sorted_values) - 1)))]
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, warmup: int) -> dict:
+    from app.utils.query_stats import track_queries
+    
+    latencies = []
+    query_counts = []
+    db_times = []
+    errors = 0
+    numbers = count()
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def send(record: bool):
+        nonlocal errors
+        async with semaphore:
+            # Each request runs in its own task, so its queries are tracked separately
+            flow = scenario.build(next(numbers))
+            if isinstance(flow, dict):
+                flow = [flow]
+            with track_queries() as queries:
+                start = time.perf_counter()
+                responses = [await client.request(**request) for request in flow]
+                elapsed = time.perf_counter() - start
+        if record:
+            latencies.append(elapsed)
+            query_counts.append(queries.count)
+            db_times.append(queries.total_time)
+            if any(response.status_code != scenario.status for response in responses):
+                errors += 1
+    
+    for _ in range(warmup):
+        await send(record=False)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(send(record=True) for _ in range(requests)))
+    wall = time.perf_counter() - start
+    
+    latencies.sort()
+    db_times.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / wall, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "db_p50_ms": round(percentile(db_times, 0.50) * 1000, 3),
+        "queries_per_request": round(sum(query_counts) / requests, 2),
+        "max_queries": max(query_counts),
+        "query_budget": scenario.max_queries
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+async def run_benchmarks(args, seeded) -> dict:
+    import httpx
+    from app.main import app
+    
+    created_party_ids = []
+    
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for scenario in build_scenarios(seeded, created_party_ids):
+            if args.only and not any(pattern in scenario.name for pattern in args.only):
+                continue
+            if scenario.name.startswith("DELETE"):
+                # Delete the parties the create scenario made, one per request
+                requests = len(created_party_ids) - args.warmup
+                if requests <= 0:
+                    continue
+            else:
+                requests = args.requests
+            
+            result = await run_scenario(client, scenario, requests, args.concurrency, args.warmup)
+            if scenario.name == "POST /api/parties/":
+                created_party_ids.extend(await _created_party_ids(client, seeded))
+            results[scenario.name] = result
+            print(
+                f"{scenario.name:<72} {result['throughput_rps']:>8.1f} req/s  "
+                f"p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  p99 {result['p99_ms']:>8.2f} ms  "
+                f"{result['queries_per_request']:>6.2f} queries  {result['errors']} errors"
+            )
+            if result["max_queries"] > result["query_budget"]:
+                print(f"    ⚠️  {result['max_queries']} queries in one request, budget is {result['query_budget']}")
+    return results
+
+async def _created_party_ids(client, seeded) -> List[int]:
+    response = await client.get("/api/parties/", headers={"Authorization": f"Bearer {seeded.host_token}"})
+    return [party["id"] for party in response.json() if party["name"].startswith("Bench Party")]
+
+def use_database(database_url: Optional[str] = None) -> str:
+    """Point the app at database_url, else DATABASE_URL from the environment, else a new SQLite file.
+
+    Must be called before any app module is imported: they read it at import.
+    """
+    database_url = database_url or os.environ.get("DATABASE_URL")
+    if not database_url:
+        database_url = f"sqlite:///{tempfile.mkdtemp(prefix='thirddegree-bench-')}/bench.db"
+    os.environ["DATABASE_URL"] = database_url
+    return database_url
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="database to seed and benchmark (default: DATABASE_URL or a new SQLite file)")
+    parser.add_argument("--requests", type=int, default=200, help="measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10, help="requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint")
+    parser.add_argument("--only", action="append", help="run only endpoints whose name contains this (repeatable)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    defaults = SeedShape()
+    shape = parser.add_argument_group("data shape")
+    shape.add_argument("--hosts", type=int, default=defaults.hosts)
+    shape.add_argument("--parties-per-host", type=int, default=defaults.parties_per_host)
+    shape.add_argument("--party-rsvps", type=int, default=defaults.party_rsvps)
+    shape.add_argument("--large-party-rsvps", type=int, default=defaults.large_party_rsvps)
+    shape.add_argument(
+        "--sized-party-rsvps", type=int, nargs="*", default=list(defaults.sized_party_rsvps),
+        help="seed one extra party with each of these RSVP counts (none to skip)"
+    )
+    shape.add_argument("--tree", choices=sorted(TREE_SHAPES), default=defaults.tree)
+    shape.add_argument("--frequent-guest-parties", type=int, default=defaults.frequent_guest_parties)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    
+    database_url = use_database(args.database_url)
+    
+    from sqlalchemy.engine import make_url
+    from benchmarks.seed import seed
+    
+    shape = SeedShape(
+        hosts=args.hosts,
+        parties_per_host=args.parties_per_host,
+        party_rsvps=args.party_rsvps,
+        large_party_rsvps=args.large_party_rsvps,
+        sized_party_rsvps=tuple(args.sized_party_rsvps),
+        tree=args.tree,
+        frequent_guest_parties=args.frequent_guest_parties
+    )
+    print(f"Seeding {make_url(database_url).get_backend_name()} database...")
+    start = time.perf_counter()
+    seeded = seed(shape)
+    print(f"Seeded {seeded.counts} in {time.perf_counter() - start:.1f}s\n")
+    
+    results = asyncio.run(run_benchmarks(args, seeded))
+    
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "database": make_url(database_url).get_backend_name(),
+            "database_async": os.getenv("DATABASE_ASYNC", "false"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "shape": asdict(shape),
+            "seeded": seeded.counts
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    
+    over_budget = [name for name, result in results.items() if result["max_queries"] > result["query_budget"]]
+    if over_budget:
+        print(f"\n❌ Over query budget: {', '.join(over_budget)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Synthetic hosts, parties and invitation trees for benchmarking."""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import func, insert, select, text
+
+from app.database import Base, get_engine
+from app.models import Host, Party, RSVP, RSVPClosure
+from app.utils.helpers import generate_invite_code, generate_rsvp_invitation_code
+from app.utils.security import create_access_token, get_password_hash
+from benchmarks.shapes import HOST_PASSWORD, TREE_SHAPES, SeedShape
+
+BATCH_SIZE = 5000
+
+@dataclass
+class SizedParty:
+    """A party seeded with an exact number of RSVPs, for comparing endpoints across party sizes."""
+    rsvps: int
+    party_id: int
+    invite_code: str
+    inviter_code: str  # A 2nd degree invitation code in the party
+
+@dataclass
+class SeedResult:
+    """Handles the benchmark scenarios need into the seeded data."""
+    host_phone: str
+    host_token: str
+    legacy_host_token: str  # Carries only the phone, as tokens did before the hid claim
+    large_party_id: int
+    large_party_code: str
+    party_code: str
+    guest_phone: str  # A 1st degree guest of the large party
+    frequent_guest_phone: str
+    rsvp_id: int
+    inviter_code: str  # A 2nd degree invitation code in the large party
+    sized_parties: List[SizedParty] = field(default_factory=list)
+    counts: dict = field(default_factory=dict)
+
+class _Seeder:
+    def __init__(self, conn, shape: SeedShape):
+        self.conn = conn
+        self.shape = shape
+        self.random = random.Random(shape.seed)
+        self.created_at = datetime.now(timezone.utc) - timedelta(days=30)
+        self.next_id = {
+            model: (conn.scalar(select(func.max(model.id))) or 0) + 1
+            for model in (Host, Party, RSVP)
+        }
+        self.rows = {Host: [], Party: [], RSVP: [], RSVPClosure: []}
+
+    def _id(self, model) -> int:
+        value = self.next_id[model]
+        self.next_id[model] += 1
+        return value
+
+    def _timestamp(self) -> datetime:
+        self.created_at += timedelta(milliseconds=10)
+        return self.created_at
+
+    def add_host(self, phone: str, password_hash: str) -> int:
+        host_id = self._id(Host)
+        self.rows[Host].append({
+            "id": host_id, "phone": phone, "password_hash": password_hash,
+            "name": f"Host {host_id}", "is_setup_complete": True, "created_at": self._timestamp()
+        })
+        return host_id
+
+    def add_party(self, host_id: int) -> dict:
+        party_id = self._id(Party)
+        party = {
+            "id": party_id, "name": f"Party {party_id}", "host_id": host_id,
+            "start_time": datetime.now(timezone.utc) + timedelta(days=7), "location": "123 Main St",
+            "description": "Synthetic benchmark party", "invite_code": generate_invite_code(),
+            "created_at": self._timestamp()
+        }
+        self.rows[Party].append(party)
+        return party
+
+    def add_rsvp(self, party_id: int, phone: str, degree: int, inviter, is_attending: bool) -> dict:
+        rsvp = {
+            "id": self._id(RSVP), "party_id": party_id, "guest_name": f"Guest {phone[-5:]}",
+            "guest_phone": phone, "is_attending": is_attending, "degree": degree,
+            "invited_by_rsvp_id": inviter["id"] if inviter else None,
+            "invitation_code": generate_rsvp_invitation_code() if is_attending and degree < 3 else None,
+            "is_confirmed": False, "has_sent_invitation": False, "created_at": self._timestamp()
+        }
+        rsvp["_inviter"] = inviter  # Dropped before insert
+        self.rows[RSVP].append(rsvp)
+        
+        depth = 0
+        ancestor = rsvp
+        while ancestor is not None:
+            self.rows[RSVPClosure].append(
+                {"ancestor_id": ancestor["id"], "descendant_id": rsvp["id"], "depth": depth}
+            )
+            ancestor = ancestor["_inviter"]
+            depth += 1
+        return rsvp
+
+    def add_tree(self, party_id: int, size: int, first_phone: int = 0) -> List[dict]:
+        """A party's RSVPs split across degrees per the tree shape, confirmed as the app would."""
+        shares = TREE_SHAPES[self.shape.tree]
+        counts = [int(size * share) for share in shares]
+        counts[0] += size - sum(counts)
+        rsvps = []
+        inviters = [None]
+        phone = first_phone
+        for degree, count in enumerate(counts, start=1):
+            if not inviters:
+                break
+            invited = []
+            for _ in range(count):
+                inviter = self.random.choice(inviters)
+                is_attending = self.random.random() < self.shape.attending_ratio
+                rsvp = self.add_rsvp(party_id, f"{phone:010d}", degree, inviter, is_attending)
+                phone += 1
+                if is_attending:
+                    invited.append(rsvp)
+                    if degree == 3:
+                        # A 3rd degree acceptance confirms the whole chain
+                        node = rsvp
+                        while node is not None:
+                            node["is_confirmed"] = True
+                            node = node["_inviter"]
+                rsvps.append(rsvp)
+            inviters = invited
+        return rsvps
+
+    def flush(self):
+        for model in (Host, Party, RSVP, RSVPClosure):
+            rows = [{key: value for key, value in row.items() if not key.startswith("_")} for row in self.rows[model]]
+            for start in range(0, len(rows), BATCH_SIZE):
+                self.conn.execute(insert(model), rows[start:start + BATCH_SIZE])
+        if self.conn.dialect.name == "postgresql":
+            # Rows were inserted with explicit ids; move the sequences past them
+            for model in (Host, Party, RSVP):
+                table = model.__tablename__
+                self.conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), (SELECT MAX(id) FROM {table}))"
+                ))
+
+def _second_degree_inviter(rsvps: List[dict]) -> dict:
+    return next(rsvp for rsvp in rsvps if rsvp["degree"] == 2 and rsvp["invitation_code"])
+
+def seed(shape: SeedShape) -> SeedResult:
+    """Create the schema if needed and insert one synthetic data set of the given shape."""
+    engine = get_engine()
+    Base.metadata.create_all(engine)
+    password_hash = get_password_hash(HOST_PASSWORD)
+    
+    with engine.begin() as conn:
+        seeder = _Seeder(conn, shape)
+        run = seeder.next_id[Host]
+        phone_base = 9_000_000_000 - run * 10_000
+        
+        host_ids = [seeder.add_host(f"{phone_base + index:010d}", password_hash) for index in range(shape.hosts)]
+        parties = [seeder.add_party(host_id) for host_id in host_ids for _ in range(shape.parties_per_host)]
+        
+        large_party = parties[0]
+        large_rsvps = seeder.add_tree(large_party["id"], shape.large_party_rsvps, first_phone=1_000_000_000)
+        for party in parties[1:]:
+            seeder.add_tree(party["id"], shape.party_rsvps, first_phone=1_000_000_000)
+        
+        sized_parties = []
+        for size in shape.sized_party_rsvps:
+            party = seeder.add_party(host_ids[0])
+            sized_parties.append((size, party, seeder.add_tree(party["id"], size, first_phone=1_000_000_000)))
+        
+        frequent_guest_phone = "5550000001"
+        for party in parties[1:1 + shape.frequent_guest_parties]:
+            seeder.add_rsvp(party["id"], frequent_guest_phone, 1, None, True)
+        
+        seeder.flush()
+    
+    guest = next(rsvp for rsvp in large_rsvps if rsvp["degree"] == 1 and rsvp["is_confirmed"])
+    inviter = _second_degree_inviter(large_rsvps)
+    host_phone = f"{phone_base:010d}"
+    return SeedResult(
+        host_phone=host_phone,
+        host_token=create_access_token({"sub": host_phone, "hid": host_ids[0]}),
+        legacy_host_token=create_access_token({"sub": host_phone}),
+        large_party_id=large_party["id"],
+        large_party_code=large_party["invite_code"],
+        party_code=parties[1]["invite_code"] if len(parties) > 1 else large_party["invite_code"],
+        guest_phone=guest["guest_phone"],
+        frequent_guest_phone=frequent_guest_phone,
+        rsvp_id=guest["id"],
+        inviter_code=inviter["invitation_code"],
+        sized_parties=[
+            SizedParty(
+                rsvps=size,
+                party_id=party["id"],
+                invite_code=party["invite_code"],
+                inviter_code=_second_degree_inviter(rsvps)["invitation_code"]
+            )
+            for size, party, rsvps in sized_parties
+        ],
+        counts={model.__tablename__: len(rows) for model, rows in seeder.rows.items()}
+    )
@@ -0,0 +1,102 @@
+"""Compare the two ways the host's RSVP list has been serialized.
+
+Encodes the same --rows RSVP rows with referrer names as a response body:
+
+- dicts: the RSVP list endpoints before they used compiled models. A dict is
+  built by hand per row, FastAPI's jsonable_encoder walks the list, and
+  JSONResponse renders it with json.dumps.
+- adapter: what GET /api/rsvp/party/{invite_code}/rsvps/all does now, a
+  TypeAdapter over PartyRSVPResponse that validates the rows from their
+  attributes and dumps JSON bytes in one pass.
+
+Reports the best time of --repeat runs and the peak traced allocations of one
+run. Needs no database.
+
+    python -m benchmarks.serialization [--rows 10000]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from typing import List
+
+import pydantic
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.routes.rsvp import party_rsvps_adapter
+
+def build_rows(rows: int) -> List[SimpleNamespace]:
+    """Rows shaped like the endpoint's query results: RSVP columns plus referrer_name."""
+    created_at = datetime(2030, 1, 1, 20, 0)
+    return [
+        SimpleNamespace(
+            id=n, guest_name=f"Guest {n}", guest_phone=f"{5_000_000_000 + n:010d}", is_attending=n % 7 != 0,
+            party_id=1, degree=n % 3 + 1, invited_by_rsvp_id=n - 1 if n % 3 else None,
+            invitation_code=f"CODE{n:06d}" if n % 3 != 2 else None, is_confirmed=n % 2 == 0,
+            has_sent_invitation=False, created_at=created_at + timedelta(seconds=n),
+            referrer_name=f"Guest {n - 1}" if n % 3 else "Host (1st degree)"
+        )
+        for n in range(rows)
+    ]
+
+def encode_dicts(rows) -> bytes:
+    content = [
+        {
+            "id": row.id,
+            "guest_name": row.guest_name,
+            "guest_phone": row.guest_phone,
+            "is_attending": row.is_attending,
+            "party_id": row.party_id,
+            "degree": row.degree,
+            "invited_by_rsvp_id": row.invited_by_rsvp_id,
+            "invitation_code": row.invitation_code,
+            "is_confirmed": row.is_confirmed,
+            "has_sent_invitation": row.has_sent_invitation,
+            "created_at": row.created_at.isoformat(),
+            "referrer_name": row.referrer_name
+        }
+        for row in rows
+    ]
+    return JSONResponse(jsonable_encoder(content)).body
+
+def encode_adapter(rows) -> bytes:
+    return party_rsvps_adapter.dump_json(party_rsvps_adapter.validate_python(rows, from_attributes=True))
+
+def best_time(encode, rows, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(rows)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def peak_allocations(encode, rows) -> int:
+    tracemalloc.start()
+    try:
+        encode(rows)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="RSVP rows in the list")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs of each encoder")
+    args = parser.parse_args()
+    
+    rows = build_rows(args.rows)
+    encoders = {"dicts": encode_dicts, "adapter": encode_adapter}
+    bodies = {name: encode(rows) for name, encode in encoders.items()}
+    assert json.loads(bodies["dicts"]) == json.loads(bodies["adapter"]), "encoders disagree"
+    
+    print(f"{args.rows:,} RSVP rows ({len(bodies['adapter']) / 2**20:.1f} MB of JSON), pydantic {pydantic.VERSION}:")
+    for name, encode in encoders.items():
+        elapsed = best_time(encode, rows, args.repeat)
+        peak = peak_allocations(encode, rows)
+        print(f"    {name:<8} {elapsed * 1000:8.1f} ms  {peak / 2**20:6.1f} MB peak traced allocations")
+
+if __name__ == "__main__":
+    main()
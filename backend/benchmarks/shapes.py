@@ -0,0 +1,35 @@
+"""Data shapes for the synthetic benchmark data set.
+
+Kept free of app imports: benchmarks.run must settle DATABASE_URL before any
+app module is imported.
+"""
+from dataclasses import dataclass
+from typing import Tuple
+
+HOST_PASSWORD = "benchmark-password"
+
+# What the host dashboard requests on load and when a party is opened, in order
+HOST_DASHBOARD_FLOW = (
+    "/api/auth/me",
+    "/api/parties/",
+    "/api/parties/{party_id}",
+    "/api/parties/{party_id}/rsvps?limit=100",
+)
+
+# Share of a party's RSVPs at each degree for the tree shapes
+TREE_SHAPES = {
+    "wide": (0.7, 0.2, 0.1),  # Mostly guests invited by the host
+    "deep": (0.1, 0.3, 0.6),  # Most guests at the end of a full 3-degree chain
+}
+
+@dataclass
+class SeedShape:
+    hosts: int = 20
+    parties_per_host: int = 3
+    party_rsvps: int = 50  # RSVPs in each ordinary party
+    large_party_rsvps: int = 10_000  # RSVPs in the first host's first party
+    sized_party_rsvps: Tuple[int, ...] = (100, 1_000, 10_000)  # An extra party of the first host's per size
+    tree: str = "wide"  # Key of TREE_SHAPES
+    frequent_guest_parties: int = 50  # Parties one guest has RSVPed to
+    attending_ratio: float = 0.85
+    seed: int = 42
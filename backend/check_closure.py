@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Verify the rsvp_closure table against invited_by_rsvp_id, optionally rebuild it or benchmark it."""
+import argparse
+import sys
+import time
+from sqlalchemy import func, select
+
+from app.database import get_session_local
+from app.models import RSVP
+from app.utils.closure import count_subtree, rebuild_closure, verify_closure
+
+def count_subtree_recursive(rsvp_id, db):
+    """Subtree size by walking invited_by_rsvp_id with a recursive CTE (the pre-closure approach)."""
+    subtree = select(RSVP.id).where(RSVP.id == rsvp_id).cte("subtree", recursive=True)
+    subtree = subtree.union_all(select(RSVP.id).join(subtree, RSVP.invited_by_rsvp_id == subtree.c.id))
+    return db.scalar(select(func.count()).select_from(subtree))
+
+def benchmark(db, sample_size):
+    """Time subtree counts for a sample of 1st degree RSVPs both ways."""
+    rsvp_ids = db.scalars(
+        select(RSVP.id).where(RSVP.invited_by_rsvp_id.is_(None)).order_by(func.random()).limit(sample_size)
+    ).all()
+    if not rsvp_ids:
+        print("⚠️  No RSVPs to benchmark")
+        return
+    
+    for label, count in (("closure table", count_subtree), ("recursive CTE", count_subtree_recursive)):
+        start = time.perf_counter()
+        for rsvp_id in rsvp_ids:
+            count(rsvp_id, db)
+        elapsed = time.perf_counter() - start
+        print(f"   {label}: {elapsed / len(rsvp_ids) * 1000:.3f} ms per subtree count ({len(rsvp_ids)} RSVPs)")
+
+parser = argparse.ArgumentParser(description=__doc__)
+parser.add_argument("--rebuild", action="store_true", help="rebuild rsvp_closure if it is inconsistent")
+parser.add_argument("--benchmark", type=int, metavar="N", help="time subtree counts for N RSVPs")
+args = parser.parse_args()
+
+db = get_session_local()()
+try:
+    result = verify_closure(db)
+    if not result["missing"] and not result["extra"]:
+        print("✅ rsvp_closure is consistent")
+    else:
+        print(f"❌ rsvp_closure is inconsistent: {result['missing']} rows missing, {result['extra']} extra")
+        if not args.rebuild:
+            print("   Run with --rebuild to regenerate it")
+            sys.exit(1)
+        rebuild_closure(db)
+        db.commit()
+        print("✅ rsvp_closure rebuilt")
+    
+    if args.benchmark:
+        print("\n⏱️  Benchmarking subtree counts...")
+        benchmark(db, args.benchmark)
+finally:
+    db.close()
@@ -0,0 +1,19 @@
+"""Gunicorn settings, loaded automatically when gunicorn starts from backend/."""
+import os
+import shutil
+import tempfile
+
+# Workers write Prometheus samples here so /metrics can aggregate all of them.
+# Set before workers fork so they inherit it before importing prometheus_client.
+prometheus_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "thirddegree-prometheus")
+)
+
+def on_starting(server):
+    # Samples from a previous run would otherwise be added to this one's
+    shutil.rmtree(prometheus_dir, ignore_errors=True)
+    os.makedirs(prometheus_dir, exist_ok=True)
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,120 @@
+"""Fixtures for API tests against a throwaway database.
+
+Tests use a fresh SQLite file, or TEST_DATABASE_URL when it is set; point it
+at an empty PostgreSQL database to run the PostgreSQL-only tests too:
+
+    TEST_DATABASE_URL=postgresql://user@localhost/thirddegree_test python -m pytest
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+import pytest
+
+# Must be settled before app modules are imported: they read it at import
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL") or (
+    f"sqlite:///{tempfile.mkdtemp(prefix='thirddegree-test-')}/test.db"
+)
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+from app.database import Base, get_engine, get_session_local
+from app.main import app
+from app.models import Host, Party
+from app.utils.helpers import generate_invite_code
+from app.utils.security import create_access_token
+
+IS_POSTGRES = make_url(TEST_DATABASE_URL).get_backend_name() == "postgresql"
+requires_postgres = pytest.mark.skipif(not IS_POSTGRES, reason="needs TEST_DATABASE_URL set to a PostgreSQL database")
+
+_phones = count(2_000_000_000)
+
+def next_phone() -> str:
+    """A phone number no other test has used."""
+    return f"{next(_phones):010d}"
+
+@pytest.fixture(scope="session")
+def engine():
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    return engine
+
+@pytest.fixture(scope="session")
+def client(engine):
+    with TestClient(app) as client:
+        yield client
+
+@pytest.fixture
+def db(engine):
+    with get_session_local()() as session:
+        yield session
+
+@pytest.fixture
+def host(db):
+    """A host, with the Authorization header for its token."""
+    host = Host(phone=next_phone(), password_hash="!", name="Test Host", is_setup_complete=True)
+    db.add(host)
+    db.commit()
+    host.headers = {"Authorization": f"Bearer {create_access_token({'sub': host.phone, 'hid': host.id})}"}
+    return host
+
+@pytest.fixture
+def make_party(db, host):
+    """Create a party for the test's host: make_party(name="Test Party")."""
+    def make(name="Test Party"):
+        party = Party(
+            name=name,
+            start_time=datetime.now(timezone.utc) + timedelta(days=7),
+            location="123 Main St",
+            invite_code=generate_invite_code(),
+            host_id=host.id
+        )
+        db.add(party)
+        db.commit()
+        return party
+    return make
+
+@pytest.fixture
+def party(make_party):
+    return make_party()
+
+@pytest.fixture
+def submit_rsvp(client):
+    """POST an RSVP and return the response body: submit_rsvp(invite_code, invited_by_code=None, ...)."""
+    def submit(invite_code, invited_by_code=None, phone=None, is_attending=True, name="Test Guest"):
+        response = client.post(f"/api/rsvp/party/{invite_code}/rsvp", json={
+            "guest_name": name,
+            "guest_phone": phone or next_phone(),
+            "is_attending": is_attending,
+            "invited_by_code": invited_by_code
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+    return submit
+
+@pytest.fixture
+def chain(party, submit_rsvp):
+    """An unconfirmed 1st -> 2nd degree chain of attending guests; returns both RSVPs."""
+    first = submit_rsvp(party.invite_code)
+    second = submit_rsvp(party.invite_code, first["invitation_code"])
+    return first, second
+
+@contextmanager
+def count_commits():
+    """Count transactions committed on any engine in this context: with count_commits() as commits: ... commits[0]."""
+    commits = [0]
+    
+    def on_commit(conn):
+        commits[0] += 1
+    
+    event.listen(Engine, "commit", on_commit)
+    try:
+        yield commits
+    finally:
+        event.remove(Engine, "commit", on_commit)
@@ -0,0 +1,83 @@
+"""Live RSVP events: one published event reaches hundreds of subscribers quickly, on every backend,
+and the public stream reveals no more than the public guest list."""
+import asyncio
+import json
+import time
+from contextlib import AsyncExitStack
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.routes import rsvp as rsvp_routes
+from app.utils.events import EventBroker, LocalEventBackend, PostgresEventBackend, party_channel
+from conftest import TEST_DATABASE_URL, next_phone, requires_postgres
+
+SUBSCRIBERS = 500
+EVENTS = 20
+# Median time from publishing an event to the last subscriber receiving it
+FAN_OUT_BUDGET = 0.1
+
+async def _next_event(subscriber: asyncio.Queue) -> dict:
+    while True:
+        event = json.loads(await subscriber.get())
+        if event["type"] != "warmup":
+            return event
+
+async def _fan_out_latencies(broker: EventBroker, channel: str) -> list:
+    async with AsyncExitStack() as stack:
+        subscribers = [await stack.enter_async_context(broker.subscribe(channel)) for _ in range(SUBSCRIBERS)]
+        
+        # The PostgreSQL backend connects its listener in the background
+        while True:
+            broker.publish(channel, {"type": "warmup"})
+            try:
+                await asyncio.wait_for(subscribers[0].get(), 0.5)
+                break
+            except asyncio.TimeoutError:
+                continue
+        
+        latencies = []
+        for n in range(EVENTS):
+            start = time.perf_counter()
+            # Published from a worker thread, as sync endpoints do
+            await asyncio.to_thread(broker.publish, channel, {"type": "rsvp.created", "n": n})
+            events = [await _next_event(subscriber) for subscriber in subscribers]
+            latencies.append(time.perf_counter() - start)
+            assert [event["n"] for event in events] == [n] * SUBSCRIBERS
+    return sorted(latencies)
+
+def _postgres_backend():
+    # psycopg2 takes a libpq URL without SQLAlchemy's driver suffix
+    dsn = make_url(TEST_DATABASE_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+    return PostgresEventBackend(dsn)
+
+@pytest.mark.parametrize("make_backend", [
+    pytest.param(LocalEventBackend, id="local"),
+    pytest.param(_postgres_backend, marks=requires_postgres, id="postgres")
+])
+def test_event_reaches_hundreds_of_subscribers(make_backend):
+    broker = EventBroker(make_backend())
+    latencies = asyncio.run(_fan_out_latencies(broker, "party:fan-out"))
+    median = latencies[len(latencies) // 2]
+    
+    assert median < FAN_OUT_BUDGET
+    assert broker.stats()["subscribers"] == 0
+
+def test_declined_rsvps_are_streamed_without_names(party, submit_rsvp, monkeypatch):
+    published = []
+    monkeypatch.setattr(rsvp_routes.event_broker, "publish", lambda channel, event: published.append((channel, event)))
+    phone = next_phone()
+    
+    submit_rsvp(party.invite_code, phone=phone, name="Attending Guest")
+    submit_rsvp(party.invite_code, phone=phone, name="Declining Guest", is_attending=False)
+    submit_rsvp(party.invite_code, name="Declined Guest", is_attending=False)
+    
+    assert [channel for channel, _ in published] == [party_channel(party.id)] * 3
+    attending, updated, declined = [event for _, event in published]
+    assert attending["type"] == "rsvp.created"
+    assert attending["rsvp"]["guest_name"] == "Attending Guest"
+    assert updated["type"] == "rsvp.updated"
+    assert declined["type"] == "rsvp.created"
+    for event in (updated, declined):
+        assert not event["rsvp"]["is_attending"]
+        assert "guest_name" not in event["rsvp"]
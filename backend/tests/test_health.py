@@ -0,0 +1,31 @@
+"""Operational endpoints: /health is public, the per-worker stats and /metrics need the metrics token."""
+import pytest
+
+from app.utils import metrics
+
+GUARDED_URLS = ["/health/db", "/health/cache", "/health/events", "/metrics"]
+TOKEN = "test-metrics-token"
+
+@pytest.fixture
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", TOKEN)
+    return TOKEN
+
+def test_health_check_is_public(client, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+    assert client.get("/health").json() == {"status": "healthy"}
+
+@pytest.mark.parametrize("url", GUARDED_URLS)
+def test_stats_are_not_served_without_a_configured_token(client, monkeypatch, url):
+    monkeypatch.setattr(metrics, "METRICS_TOKEN", None)
+    assert client.get(url, headers={"Authorization": "Bearer anything"}).status_code == 404
+
+@pytest.mark.parametrize("url", GUARDED_URLS)
+def test_stats_need_the_metrics_token(client, metrics_token, url):
+    assert client.get(url).status_code == 401
+    assert client.get(url, headers={"Authorization": "Bearer wrong-token"}).status_code == 401
+    assert client.get(url, headers={"Authorization": f"Bearer {metrics_token}"}).status_code == 200
+
+def test_cache_stats_cover_every_cache(client, metrics_token):
+    response = client.get("/health/cache", headers={"Authorization": f"Bearer {metrics_token}"})
+    assert set(response.json()) == {"party", "host", "tree"}
@@ -0,0 +1,64 @@
+"""Host RSVP list pagination: following X-Next-Cursor visits every matching RSVP exactly once."""
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from app.models import RSVP
+
+PAGE_SIZE = 3
+FILTERS = [
+    {},
+    {"is_attending": True},
+    {"is_attending": False},
+    {"degree": 1},
+    {"degree": 2},
+    {"degree": 3},
+    {"is_confirmed": True},
+    {"is_confirmed": False},
+    {"is_attending": True, "degree": 1, "is_confirmed": False}
+]
+
+@pytest.fixture
+def same_instant_party(db, party, submit_rsvp):
+    """The test party with RSVPs of every degree and state, all created at the same instant."""
+    firsts = [submit_rsvp(party.invite_code, is_attending=n % 3 != 0) for n in range(7)]
+    seconds = [submit_rsvp(party.invite_code, first["invitation_code"]) for first in firsts[1:3]]
+    submit_rsvp(party.invite_code, seconds[0]["invitation_code"])
+    submit_rsvp(party.invite_code, seconds[1]["invitation_code"], is_attending=False)
+    # Ties on created_at leave only the id to keep pages apart
+    db.execute(update(RSVP).where(RSVP.party_id == party.id).values(created_at=datetime(2025, 1, 1, 20)))
+    db.commit()
+    return party
+
+def _walk_pages(client, host, party_id, filters: dict) -> list:
+    params = {**filters, "limit": PAGE_SIZE}
+    ids = []
+    while True:
+        response = client.get(f"/api/parties/{party_id}/rsvps", params=params, headers=host.headers)
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page) <= PAGE_SIZE
+        ids.extend(rsvp["id"] for rsvp in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return ids
+        params["cursor"] = cursor
+
+@pytest.mark.parametrize("filters", FILTERS, ids=lambda filters: ",".join(f"{k}={v}" for k, v in filters.items()) or "all")
+def test_cursor_pages_cover_each_filter_without_duplicates_or_gaps(client, db, host, same_instant_party, filters):
+    rsvps = db.query(RSVP).filter(RSVP.party_id == same_instant_party.id).all()
+    expected = sorted(
+        rsvp.id for rsvp in rsvps
+        if all(getattr(rsvp, field) == value for field, value in filters.items())
+    )
+    assert expected  # Every filter matches someone in the fixture
+    
+    assert _walk_pages(client, host, same_instant_party.id, filters) == expected
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", base64.urlsafe_b64encode(b"abc").decode()])
+def test_malformed_cursor_is_rejected(client, host, party, cursor):
+    response = client.get(f"/api/parties/{party.id}/rsvps", params={"cursor": cursor, "limit": PAGE_SIZE}, headers=host.headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,183 @@
+"""Statements and commits per request, so N+1 lookups and extra round trips can't creep back in.
+
+Budgets assume the party is already in the party cache, as it is after the
+first request for it.
+"""
+import pytest
+from sqlalchemy import select
+
+from app.models import RSVP
+from app.utils.cache import party_cache
+from app.utils.query_stats import assert_query_budget, track_queries
+from conftest import count_commits, next_phone
+
+# Insert, closure rows, party version bump; deeper RSVPs add the inviter lookup
+# and then chain confirmation
+RSVP_QUERIES_BY_DEGREE = {1: 3, 2: 4, 3: 5}
+THIRD_DEGREE_RSVP_QUERIES = RSVP_QUERIES_BY_DEGREE[3]
+# Conflicting insert, update of the existing RSVP, party version bump
+UPDATE_RSVP_QUERIES = 3
+# Code allocation insert, refresh
+CREATE_PARTY_QUERIES = 2
+# The party's version; an unchanged page is answered without reading RSVPs
+CONDITIONAL_GET_QUERIES = 1
+# The guest's RSVPs with their parties, then every first downstream acceptance
+GUEST_DASHBOARD_QUERIES = 2
+# A guest's RSVP page view: the party, then who's coming. The version lookup
+# loads the party row, so neither request looks it up again.
+PARTY_PAGE_QUERIES = {
+    "/api/rsvp/party/{invite_code}": 1,
+    "/api/rsvp/party/{invite_code}/rsvps?limit=100": 3  # Plus the counts and one page of guests
+}
+# Requests that take the party from the party cache, saving their party lookup
+PARTY_CACHE_URLS = ("/api/rsvp/party/{invite_code}/rsvps/all?limit=100",)
+
+def test_third_degree_rsvp_confirms_chain_in_constant_queries(db, party, chain, submit_rsvp):
+    first, second = chain
+    
+    with assert_query_budget(THIRD_DEGREE_RSVP_QUERIES) as confirming:
+        rsvp = submit_rsvp(party.invite_code, second["invitation_code"])
+    assert rsvp["degree"] == 3
+    assert rsvp["is_confirmed"]
+    assert rsvp["chain_confirmed_count"] == 2
+    assert db.scalars(select(RSVP.is_confirmed).where(RSVP.id.in_([first["id"], second["id"]]))).all() == [True, True]
+    
+    # Once the chain is confirmed there is nothing left to confirm, at the same cost
+    with assert_query_budget(THIRD_DEGREE_RSVP_QUERIES) as confirmed:
+        rsvp = submit_rsvp(party.invite_code, second["invitation_code"])
+    assert rsvp["chain_confirmed_count"] == 0
+    assert confirmed.count == confirming.count
+
+def _confirmed_guest_in_parties(guest_phone, parties, submit_rsvp):
+    """RSVP guest_phone to each party as a 1st degree guest whose chain is then completed."""
+    for party in parties:
+        guest = submit_rsvp(party.invite_code, phone=guest_phone)
+        second = submit_rsvp(party.invite_code, guest["invitation_code"], name="Second Degree")
+        submit_rsvp(party.invite_code, second["invitation_code"])
+
+def test_guest_dashboard_queries_do_not_grow_with_rsvps(client, make_party, submit_rsvp):
+    guest_phone = next_phone()
+    _confirmed_guest_in_parties(guest_phone, [make_party()], submit_rsvp)
+    with assert_query_budget(GUEST_DASHBOARD_QUERIES) as one_party:
+        response = client.get(f"/api/rsvp/guest/{guest_phone}/rsvps")
+    assert len(response.json()) == 1
+    
+    _confirmed_guest_in_parties(guest_phone, [make_party(f"Party {n}") for n in range(10)], submit_rsvp)
+    with assert_query_budget(GUEST_DASHBOARD_QUERIES) as many_parties:
+        response = client.get(f"/api/rsvp/guest/{guest_phone}/rsvps")
+    
+    rsvps = response.json()
+    assert len(rsvps) == 11
+    assert all(rsvp["is_confirmed"] and rsvp["party"]["name"] for rsvp in rsvps)
+    assert all(rsvp["first_downstream_acceptance"]["name"] == "Second Degree" for rsvp in rsvps)
+    assert many_parties.count == one_party.count
+
+@pytest.mark.parametrize("degree", [1, 2, 3])
+def test_rsvp_is_one_commit_at_every_degree(party, chain, submit_rsvp, degree):
+    inviter = {1: None, 2: chain[0], 3: chain[1]}[degree]
+    
+    with count_commits() as commits, assert_query_budget(RSVP_QUERIES_BY_DEGREE[degree]):
+        rsvp = submit_rsvp(party.invite_code, inviter and inviter["invitation_code"])
+    assert rsvp["degree"] == degree
+    assert commits[0] == 1
+
+def test_rsvp_update_is_one_commit(party, submit_rsvp):
+    phone = next_phone()
+    submit_rsvp(party.invite_code, phone=phone)
+    
+    with count_commits() as commits, assert_query_budget(UPDATE_RSVP_QUERIES):
+        rsvp = submit_rsvp(party.invite_code, phone=phone, is_attending=False, name="Renamed Guest")
+    assert rsvp["guest_name"] == "Renamed Guest"
+    assert not rsvp["is_attending"]
+    assert commits[0] == 1
+
+def test_rsvp_update_ignores_an_invalid_invitation_code(client, party, submit_rsvp):
+    phone = next_phone()
+    submit_rsvp(party.invite_code, phone=phone)
+    
+    # The inviter lookup, then the update and version bump
+    with count_commits() as commits, assert_query_budget(UPDATE_RSVP_QUERIES + 1):
+        rsvp = submit_rsvp(party.invite_code, "NOSUCHCODE", phone=phone, name="Renamed Guest")
+    assert rsvp["guest_name"] == "Renamed Guest"
+    assert rsvp["degree"] == 1
+    assert commits[0] == 1
+    
+    # A new guest with the same code is still turned away
+    response = client.post(f"/api/rsvp/party/{party.invite_code}/rsvp", json={
+        "guest_name": "New Guest", "guest_phone": next_phone(), "is_attending": True, "invited_by_code": "NOSUCHCODE"
+    })
+    assert response.status_code == 400
+
+def test_create_party_is_one_commit(client, host):
+    with count_commits() as commits, assert_query_budget(CREATE_PARTY_QUERIES):
+        response = client.post("/api/parties/", headers=host.headers, json={
+            "name": "Budget Party",
+            "start_time": "2030-01-01T20:00:00Z",
+            "location": "123 Main St"
+        })
+    assert response.status_code == 200, response.text
+    assert commits[0] == 1
+
+def test_guest_dashboard_does_not_commit(client, party, submit_rsvp):
+    guest_phone = next_phone()
+    _confirmed_guest_in_parties(guest_phone, [party], submit_rsvp)
+    
+    with count_commits() as commits, assert_query_budget(GUEST_DASHBOARD_QUERIES):
+        response = client.get(f"/api/rsvp/guest/{guest_phone}/rsvps")
+    assert response.status_code == 200
+    assert commits[0] == 0
+
+@pytest.mark.parametrize("page", ["party", "party rsvps", "guest rsvp"])
+def test_not_modified_party_page_reads_only_the_version(client, party, submit_rsvp, page):
+    guest_phone = next_phone()
+    submit_rsvp(party.invite_code, phone=guest_phone)
+    url = {
+        "party": f"/api/rsvp/party/{party.invite_code}",
+        "party rsvps": f"/api/rsvp/party/{party.invite_code}/rsvps",
+        "guest rsvp": f"/api/rsvp/guest/{guest_phone}/party/{party.invite_code}"
+    }[page]
+    etag = client.get(url).headers["ETag"]
+    
+    with assert_query_budget(CONDITIONAL_GET_QUERIES):
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    
+    # Any RSVP moves the version on, so the old ETag gets the full page again
+    submit_rsvp(party.invite_code)
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+def _party_cache_requests_queries(client, invite_code: str, views: int) -> int:
+    with track_queries() as queries:
+        for _ in range(views):
+            for url in PARTY_CACHE_URLS:
+                assert client.get(url.format(invite_code=invite_code)).status_code == 200
+    return queries.count
+
+def test_party_cache_saves_a_query_per_request(client, party, submit_rsvp, monkeypatch):
+    submit_rsvp(party.invite_code)
+    views = 10
+    
+    party_cache.invalidate(party.invite_code)
+    hits = party_cache.stats()["hits"]
+    cached = _party_cache_requests_queries(client, party.invite_code, views)
+    # Only the first request loads the party
+    assert party_cache.stats()["hits"] - hits == views * len(PARTY_CACHE_URLS) - 1
+    
+    # A cache that keeps nothing: every request loads the party again
+    monkeypatch.setattr(party_cache, "maxsize", 0)
+    party_cache.invalidate(party.invite_code)
+    uncached = _party_cache_requests_queries(client, party.invite_code, views)
+    
+    assert uncached - cached == views * len(PARTY_CACHE_URLS) - 1
+
+@pytest.mark.parametrize("url", PARTY_PAGE_QUERIES)
+def test_party_page_reads_the_party_once(client, party, submit_rsvp, url):
+    submit_rsvp(party.invite_code)
+    # Cold cache: the page must not look the party up a second time
+    party_cache.invalidate(party.invite_code)
+    
+    with assert_query_budget(PARTY_PAGE_QUERIES[url]):
+        response = client.get(url.format(invite_code=party.invite_code))
+    assert response.status_code == 200
+    assert response.headers["ETag"]
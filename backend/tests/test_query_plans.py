@@ -0,0 +1,147 @@
+"""Query plans for the RSVP access paths: no route may fall back to a full scan of rsvps or rsvp_closure.
+
+Each route is called through the API while its statements are recorded, then
+every recorded statement is explained. SQLite uses EXPLAIN QUERY PLAN.
+PostgreSQL uses EXPLAIN with sequential scans disabled, because on tables this
+small its planner would otherwise prefer them even where an index applies; an
+index scan that doesn't constrain the index's leading column counts as a full
+scan there too.
+"""
+import re
+import tempfile
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, List
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.engine import Engine
+
+from app.models import RSVP, RSVPClosure
+from conftest import IS_POSTGRES, next_phone
+
+CHECKED_TABLES = ("rsvps", "rsvp_closure")
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (TABLE )?(rsvps|rsvp_closure)(_\d+)?\b")
+
+@contextmanager
+def recorded_statements():
+    """Collect (statement, parameters) for every single-row statement run in this context."""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            return
+        if conn.dialect.paramstyle == "numeric_dollar":
+            # asyncpg's $1 placeholders, which may repeat; plans are explained through psycopg2
+            statement = re.sub(r"\$(\d+)", r"%(p\1)s", statement)
+            parameters = {f"p{number}": value for number, value in enumerate(parameters, start=1)}
+        statements.append((statement, parameters))
+    
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+@pytest.fixture(scope="module")
+def leading_columns(engine) -> Dict[str, str]:
+    """First column of every index on the checked tables, primary keys included."""
+    inspector = inspect(engine)
+    columns = {}
+    for table in CHECKED_TABLES:
+        primary_key = inspector.get_pk_constraint(table)
+        columns[primary_key["name"]] = primary_key["constrained_columns"][0]
+        columns.update((index["name"], index["column_names"][0]) for index in inspector.get_indexes(table))
+    return columns
+
+def _postgres_full_scans(node: dict, leading_columns: Dict[str, str]) -> List[str]:
+    """Sequential scans of the checked tables, and scans of their indexes that don't seek on the leading column."""
+    found = []
+    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in CHECKED_TABLES:
+        found.append(f"Seq Scan on {node['Relation Name']}")
+    index = node.get("Index Name")
+    if index in leading_columns and not re.search(rf"\b{leading_columns[index]}\b", node.get("Index Cond", "")):
+        found.append(f"{node['Node Type']} on {index} without a condition on {leading_columns[index]}")
+    for child in node.get("Plans", []):
+        found += _postgres_full_scans(child, leading_columns)
+    return found
+
+def full_scans(engine, statement: str, parameters, leading_columns: Dict[str, str]) -> List[str]:
+    """The steps of the statement's plan that read all of rsvps or rsvp_closure."""
+    with engine.connect() as conn:
+        if not IS_POSTGRES:
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[-1] for row in plan if SQLITE_FULL_SCAN.search(row[-1])]
+        # Rolled back with the connection's transaction
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        return _postgres_full_scans(plan[0]["Plan"], leading_columns)
+
+def _follow_cursor(client, url, headers=None):
+    """Fetch the first page of url (limit=1) and then the page its cursor points to."""
+    first = client.get(f"{url}limit=1", headers=headers)
+    cursor = first.headers.get("X-Next-Cursor") or first.json().get("next_cursor")
+    assert cursor, first.text
+    return client.get(f"{url}limit=1&cursor={cursor}", headers=headers)
+
+def _import_guests(t):
+    upload = f"guest_name,guest_phone,is_attending\nImported,{next_phone()},yes\n"
+    return t.client.post(
+        f"/api/parties/{t.party.id}/rsvps/import", headers=t.host.headers,
+        files={"file": ("guests.csv", upload, "text/csv")}
+    )
+
+# Route -> call exercising it, given the test's client, party, host, submit_rsvp and chain
+ROUTES = {
+    "create 1st degree RSVP": lambda t: t.submit_rsvp(t.party.invite_code),
+    "create 3rd degree RSVP": lambda t: t.submit_rsvp(t.party.invite_code, t.second["invitation_code"]),
+    "update existing RSVP": lambda t: t.submit_rsvp(t.party.invite_code, phone=t.first["guest_phone"], name="Renamed"),
+    "party by invite code": lambda t: t.client.get(f"/api/rsvp/party/{t.party.invite_code}"),
+    "RSVP details": lambda t: t.client.get(f"/api/rsvp/rsvp/{t.first['id']}"),
+    "guest dashboard": lambda t: t.client.get(f"/api/rsvp/guest/{t.first['guest_phone']}/rsvps"),
+    "guest party RSVP": lambda t: t.client.get(f"/api/rsvp/guest/{t.first['guest_phone']}/party/{t.party.invite_code}"),
+    "public RSVP list page": lambda t: _follow_cursor(t.client, f"/api/rsvp/party/{t.party.invite_code}/rsvps?"),
+    "host RSVP list page": lambda t: _follow_cursor(t.client, f"/api/rsvp/party/{t.party.invite_code}/rsvps/all?is_attending=true&"),
+    "party RSVPs page": lambda t: _follow_cursor(t.client, f"/api/parties/{t.party.id}/rsvps?degree=1&", t.host.headers),
+    "RSVP export": lambda t: t.client.get(f"/api/parties/{t.party.id}/rsvps/export", headers=t.host.headers),
+    "invitation tree": lambda t: t.client.get(f"/api/parties/{t.party.id}/tree", headers=t.host.headers),
+    "guest import": _import_guests,
+    "delete party": lambda t: t.client.delete(f"/api/parties/{t.party.id}", headers=t.host.headers),
+}
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_route_queries_use_indexes(route, engine, leading_columns, client, party, host, chain, submit_rsvp):
+    first, second = chain
+    submit_rsvp(party.invite_code)  # A second 1st degree guest, so list pages have a next page
+    
+    t = SimpleNamespace(client=client, party=party, host=host, submit_rsvp=submit_rsvp, first=first, second=second)
+    with recorded_statements() as statements:
+        response = ROUTES[route](t)
+    if not isinstance(response, dict):  # submit_rsvp checks its own status
+        assert response.status_code == 200, response.text
+    assert statements
+    
+    failures = []
+    for statement, parameters in statements:
+        scans = full_scans(engine, statement, parameters, leading_columns)
+        if scans:
+            failures.append("\n".join([statement, *scans]))
+    assert not failures, "Full scans:\n\n" + "\n\n".join(failures)
+
+def test_migrations_create_the_model_indexes(monkeypatch):
+    """The Alembic history builds the same rsvps and rsvp_closure indexes the models declare."""
+    url = f"sqlite:///{tempfile.mkdtemp(prefix='thirddegree-migrations-')}/migrations.db"
+    monkeypatch.setenv("DATABASE_URL", url)  # alembic/env.py prefers it over alembic.ini
+    config = Config()
+    config.set_main_option("script_location", "alembic")
+    command.upgrade(config, "head")
+    
+    inspector = inspect(create_engine(url))
+    for model in (RSVP, RSVPClosure):
+        declared = {index.name: index.unique for index in model.__table__.indexes}
+        migrated = {
+            index["name"]: bool(index["unique"]) for index in inspector.get_indexes(model.__tablename__)
+        }
+        assert migrated == declared, model.__tablename__
@@ -0,0 +1,39 @@
+"""Invitation tree: subtree counts per guest, cached per party version and rebuilt after every RSVP write."""
+from app.utils.cache import tree_cache
+
+def _shape(node: dict) -> tuple:
+    """A node as (id, subtree_size, confirmed_count, [children...]), for comparing whole trees."""
+    return node["id"], node["subtree_size"], node["confirmed_count"], [_shape(child) for child in node["children"]]
+
+def _get_tree(client, host, party):
+    response = client.get(f"/api/parties/{party.id}/tree", headers=host.headers)
+    assert response.status_code == 200, response.text
+    return response
+
+def test_tree_counts_a_chain_and_follows_new_rsvps(client, host, party, chain, submit_rsvp):
+    first, second = chain
+    third = submit_rsvp(party.invite_code, second["invitation_code"])
+    
+    response = _get_tree(client, host, party)
+    tree = response.json()
+    assert (tree["party_id"], tree["size"], tree["confirmed_count"]) == (party.id, 3, 3)
+    assert [_shape(root) for root in tree["children"]] == [
+        (first["id"], 3, 3, [(second["id"], 2, 2, [(third["id"], 1, 1, [])])])
+    ]
+    
+    # Same version: served from the cache, and unchanged to a client holding the ETag
+    hits = tree_cache.stats()["hits"]
+    assert _get_tree(client, host, party).json() == tree
+    assert tree_cache.stats()["hits"] == hits + 1
+    etag = response.headers["ETag"]
+    assert client.get(f"/api/parties/{party.id}/tree", headers={**host.headers, "If-None-Match": etag}).status_code == 304
+    
+    # A new 2nd-degree guest bumps the version, so the next read rebuilds the tree
+    fourth = submit_rsvp(party.invite_code, first["invitation_code"])
+    response = _get_tree(client, host, party)
+    assert response.headers["ETag"] != etag
+    tree = response.json()
+    assert (tree["size"], tree["confirmed_count"]) == (4, 3)
+    assert [_shape(root) for root in tree["children"]] == [
+        (first["id"], 4, 3, [(second["id"], 2, 2, [(third["id"], 1, 1, [])]), (fourth["id"], 1, 0, [])])
+    ]